@@ -30,6 +30,20 @@ def test_wsdl_path_detection():
     
     print(f"Python version: {sys.version_info.major}.{sys.version_info.minor}")
     print(f"Checking {len(potential_paths)} potential WSDL paths...\n")
+
+    # List the venv site-packages once; candidates directly inside it become set lookups
+    sp_dir = f'/opt/sai-cam/venv/lib/python{sys.version_info.major}.{sys.version_info.minor}/site-packages'
+    try:
+        with os.scandir(sp_dir) as entries:
+            sp_dirs = {e.name for e in entries if e.is_dir()}
+    except OSError:
+        sp_dirs = set()
+
+    def path_exists(check_path):
+        parent, name = os.path.split(check_path.rstrip('/'))
+        if parent == sp_dir:
+            return name in sp_dirs
+        return os.path.exists(check_path)
     
     found_paths = []
     
@@ -45,13 +59,14 @@ def test_wsdl_path_detection():
                 print(f"   Glob expansion: {matches}")
         
         for check_path in paths_to_check:
-            if os.path.exists(check_path):
+            if path_exists(check_path):
                 print(f"   ✅ EXISTS: {check_path}")
                 found_paths.append(check_path)
                 
                 # Check if it contains WSDL files
                 try:
-                    wsdl_files = [f for f in os.listdir(check_path) if f.endswith('.wsdl')]
+                    with os.scandir(check_path) as entries:
+                        wsdl_files = [e.name for e in entries if e.name.endswith('.wsdl')]
                     print(f"   📄 WSDL files: {len(wsdl_files)} found")
                     if wsdl_files:
                         print(f"      • {', '.join(wsdl_files[:3])}{'...' if len(wsdl_files) > 3 else ''}")
@@ -81,13 +96,15 @@ def test_environment_variable():
     if os.path.exists(env_file):
         print(f"📄 Loading {env_file}...")
         with open(env_file, 'r') as f:
-            for line_num, line in enumerate(f, 1):
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    if key == 'ONVIF_WSDL_PATH':
-                        print(f"   • {key}={value}")
-                        os.environ[key] = value
+            entries = dict(
+                line.split('=', 1)
+                for line in (raw.strip() for raw in f.read().splitlines())
+                if line and not line.startswith('#') and '=' in line
+            )
+        if 'ONVIF_WSDL_PATH' in entries:
+            value = entries['ONVIF_WSDL_PATH']
+            print(f"   • ONVIF_WSDL_PATH={value}")
+            os.environ['ONVIF_WSDL_PATH'] = value
     
     # Check environment variable
     wsdl_path = os.getenv('ONVIF_WSDL_PATH')
@@ -2,6 +2,8 @@
 
 import cv2
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import sys
 import logging
@@ -11,19 +13,50 @@ import signal
 import argparse
 from datetime import datetime
 from threading import Thread, Lock, Event
-from queue import Queue
+from queue import Queue, Empty
+from collections import deque, OrderedDict
+from itertools import islice
 import ssl
-import shutil
+import struct
 from pathlib import Path
 import psutil
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 import json
 from systemd import daemon
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
 import copy
+import hashlib
+import re
+import heapq
 import numpy as np
 
+# Prefer libyaml's C loader; fall back to the pure-Python loader when unavailable
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    _YamlLoader = yaml.SafeLoader
+
+try:
+    import simplejpeg
+except ImportError:
+    simplejpeg = None  # Fall back to cv2.imencode
+
+try:
+    from requests_toolbelt import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None  # Fall back to requests' in-memory multipart body
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to stdlib json for upload metadata
+
+try:
+    import httpx
+except ImportError:
+    httpx = None  # server.http2 needs httpx[http2]; uploads use requests without it
+
 # Set up path for deployed environment before local imports
 # In deployment: /opt/sai-cam/bin/camera_service.py needs to find /opt/sai-cam/logging_utils.py
 _current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -37,14 +70,181 @@ from logging_utils import RateLimitedLogger, CameraStateTracker
 
 from version import VERSION
 
+# Timestamp overlay style (BGR green, matching the original hard-coded values)
+OVERLAY_FONT = cv2.FONT_HERSHEY_SIMPLEX
+OVERLAY_COLOR = (0, 255, 0)
+
+# Health socket replies within this many seconds reuse one encoded payload
+HEALTH_CACHE_TTL = 0.5
+
 # Force FFMPEG to use TCP transport for all RTSP connections
 # Let codec auto-detect - cameras may use H.264 or H.265
 os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = "rtsp_transport;tcp"
 
+def dumps_json(obj):
+    """Serialize to JSON with orjson (bytes) when installed, else the stdlib (str)"""
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj)
+
+
+# Capture filenames: {camera_id}_{YYYY-MM-DD_HH-MM-SS}[_{repeat}].jpg
+_CAPTURE_NAME_RE = re.compile(r'(.+)_\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2}(?:_\d+)?\.jpg')
+
+
+class UploadQueue:
+    """Bounded FIFO of pending uploads that drops the oldest entry when full.
+
+    Capture threads never block on a stalled uploader: images are already on
+    disk before they are queued, so an evicted entry only loses its place in
+    the queue. take_overflow() tells the uploader to re-queue them from
+    storage once the backlog drains. Backed by a deque (appends/pops are
+    atomic under the GIL) plus an Event to wake a waiting consumer.
+    """
+
+    def __init__(self, maxsize):
+        self._items = deque(maxlen=maxsize)
+        self._ready = Event()
+        self._overflow_lock = Lock()
+        self._overflowed = False
+        self.dropped = 0
+
+    @property
+    def maxsize(self):
+        return self._items.maxlen
+
+    def put(self, item):
+        """Append an item, evicting the oldest one if the queue is full"""
+        if len(self._items) == self._items.maxlen:
+            self.dropped += 1
+            self._overflowed = True
+        self._items.append(item)
+        self._ready.set()
+
+    def take_overflow(self):
+        """Whether an entry was evicted since the last call (only one caller sees True)"""
+        with self._overflow_lock:
+            overflowed, self._overflowed = self._overflowed, False
+        return overflowed
+
+    def get_nowait(self):
+        """Pop the oldest item or raise queue.Empty"""
+        try:
+            return self._items.popleft()
+        except IndexError:
+            raise Empty from None
+
+    def get(self, timeout=None):
+        """Pop the oldest item, waiting up to timeout seconds; raises queue.Empty"""
+        try:
+            return self.get_nowait()
+        except Empty:
+            pass
+        self._ready.clear()
+        # Re-check after clearing so a put() racing with clear() is not missed
+        try:
+            return self.get_nowait()
+        except Empty:
+            pass
+        self._ready.wait(timeout)
+        return self.get_nowait()
+
+    def empty(self):
+        return not self._items
+
+    def qsize(self):
+        return len(self._items)
+
+
+class SystemMetricsSampler:
+    """System metrics for capture metadata, re-sampled at most every max_age seconds.
+
+    One instance is shared by all cameras, the health socket and HealthMonitor,
+    so readings that land in the same window reuse one round of psutil calls
+    (statvfs, /proc and thermal sysfs reads) instead of each paying for it.
+    """
+
+    # Common thermal zone names, tried before falling back to the first zone
+    TEMP_ZONES = ('cpu_thermal', 'coretemp', 'cpu-thermal', 'soc_thermal')
+    THERMAL_ROOT = '/sys/class/thermal'
+
+    def __init__(self, max_age=5.0):
+        self.max_age = max_age
+        self._lock = Lock()
+        self._sampled_at = None
+        self._metrics = {}
+        self._temp_zone = None  # Zone name found on the first successful read
+        self._temp_path = self._find_thermal_path()
+        # Prime the non-blocking CPU counter so the first snapshot isn't 0.0
+        psutil.cpu_percent(interval=None)
+
+    @classmethod
+    def _find_thermal_path(cls):
+        """Return the temp file of the preferred CPU thermal zone, or None.
+
+        Reading that one file replaces psutil.sensors_temperatures(), which
+        walks every hwmon and thermal zone on each call.
+        """
+        zones = {}
+        try:
+            with os.scandir(cls.THERMAL_ROOT) as entries:
+                for entry in entries:
+                    if not entry.name.startswith('thermal_zone'):
+                        continue
+                    try:
+                        with open(os.path.join(entry.path, 'type')) as f:
+                            zones.setdefault(f.read().strip(), os.path.join(entry.path, 'temp'))
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+        for zone in cls.TEMP_ZONES:
+            if zone in zones:
+                return zones[zone]
+        return None
+
+    def snapshot(self):
+        """Return a copy of the current metrics, sampling them if the cache is stale"""
+        now = time.monotonic()
+        with self._lock:
+            if self._sampled_at is None or now - self._sampled_at >= self.max_age:
+                self._metrics = {
+                    'cpu_percent': psutil.cpu_percent(interval=None),
+                    'memory_percent': round(psutil.virtual_memory().percent, 1),
+                    'disk_percent': round(psutil.disk_usage('/').percent, 1),
+                    'cpu_temp': self.cpu_temp(),
+                }
+                self._sampled_at = now
+            return dict(self._metrics)
+
+    def cpu_temp(self):
+        """Get CPU temperature (Raspberry Pi and other Linux systems)"""
+        if self._temp_path:
+            try:
+                with open(self._temp_path, 'rb') as f:
+                    return round(int(f.read()) / 1000.0, 1)  # millidegrees C
+            except (OSError, ValueError):
+                self._temp_path = None  # Use psutil from now on
+        try:
+            temps = psutil.sensors_temperatures()
+            if not temps:
+                return None
+            if self._temp_zone in temps and temps[self._temp_zone]:
+                return round(temps[self._temp_zone][0].current, 1)
+            # Try common thermal zone names, then the first available temperature
+            candidates = [zone for zone in self.TEMP_ZONES if zone in temps] + list(temps)
+            for zone in candidates:
+                if temps[zone]:
+                    self._temp_zone = zone
+                    return round(temps[zone][0].current, 1)
+        except Exception:
+            pass
+        return None
+
+
 class CameraInstance:
     """Represents a single camera instance with its own configuration and state"""
 
-    def __init__(self, camera_id, camera_config, global_config, logger, storage_manager, upload_queue):
+    def __init__(self, camera_id, camera_config, global_config, logger, storage_manager, upload_queue,
+                 process_pool=None, metrics_sampler=None):
         self.camera_id = camera_id
         self.config = camera_config
         self.global_config = global_config
@@ -58,6 +258,52 @@ class CameraInstance:
         self.capture_interval = self.config.get('capture_interval', 300)
         self.timestamp_last_image = time.time() - self.capture_interval
 
+        # JPEG quality: per camera, else advanced.jpeg_quality, else 95 (cv2.imencode's default)
+        self.jpeg_quality = self.config.get(
+            'jpeg_quality', global_config.get('advanced', {}).get('jpeg_quality', 95))
+
+        # Optionally drop quality while uploads back up so the queue can drain
+        self.adaptive_quality = self.config.get('adaptive_quality', False)
+        self._current_quality = self.jpeg_quality
+
+        # Optional [width, height] to downscale frames to before overlay/encode
+        target_resolution = self.config.get('target_resolution')
+        self.target_resolution = tuple(target_resolution) if target_resolution else None
+
+        # Timestamp overlay; font shrinks with the downscale so it keeps its relative size
+        self.overlay_timestamp = self.config.get('overlay_timestamp', True)
+        overlay_scale = 1.0
+        if self.target_resolution:
+            source_width = self.config.get('resolution', [1280, 720])[0]
+            overlay_scale = min(1.0, self.target_resolution[0] / source_width)
+        self.overlay_font_scale = overlay_scale
+        self.overlay_thickness = max(1, round(2 * overlay_scale))
+        self.overlay_origin = (10, max(15, round(30 * overlay_scale)))
+
+        # Optionally hand overlay/encode/store to a worker so this thread only reads frames.
+        # The service passes its shared pool; a standalone instance gets a private one.
+        self._process_executor = None
+        self._owns_process_executor = False
+        if self.config.get('process_in_worker', False):
+            if process_pool is None:
+                process_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"Process-{camera_id}")
+                self._owns_process_executor = True
+            self._process_executor = process_pool
+        self._pending_process = None
+
+        # System metrics for metadata; the service shares one sampler across cameras
+        self.metrics_sampler = metrics_sampler or SystemMetricsSampler()
+
+        # Skip encode/upload when a 64x64 grey thumbnail barely changed (0 = disabled)
+        self.motion_threshold = self.config.get('motion_threshold', 0)
+        self._prev_thumb = None
+
+        # Timestamp strings are formatted at most once per second (see format_timestamp)
+        self._ts_second = None
+        self._ts_string = ''
+        self._ts_zone = ''
+        self._ts_repeat = 0
+
         # Initialize state tracker for backoff management
         self.state_tracker = CameraStateTracker(
             camera_id=camera_id,
@@ -69,6 +315,24 @@ class CameraInstance:
         from cameras import create_camera_from_config
         self.camera = create_camera_from_config(camera_config, global_config, logger)
         self.camera_type = camera_config.get('type', 'rtsp')
+
+        # Metadata fields that never change for this instance, built once
+        # (device changes need a restart, see handle_reload)
+        device = self.global_config['device']
+        self._metadata_identity = {
+            'device_id': device['id'],
+            'camera_id': self.camera_id,
+            'location': device['location'],
+            'version': VERSION,
+            'camera_type': self.camera_type,
+        }
+        self._device_description = device.get('description', '')
+        self._start_time = self.global_config.get('_start_time', time.time())
+        self._metadata_camera = {
+            'capture_interval': self.capture_interval,
+            'position': self.config.get('position', {}),
+            'resolution': self.config.get('resolution', [1280, 720]),
+        }
         
     def setup_camera(self):
         """Initialize this specific camera using new architecture"""
@@ -78,49 +342,195 @@ class CameraInstance:
             self.logger.error(f"Camera {self.camera_id}: Setup error: {str(e)}", exc_info=True)
             return False
 
-    def _get_cpu_temp(self):
-        """Get CPU temperature (Raspberry Pi and other Linux systems)"""
+    def downscale_frame(self, frame):
+        """Shrink frame to target_resolution (INTER_AREA); never upscales"""
+        if not self.target_resolution:
+            return frame
+        target_w, target_h = self.target_resolution
+        height, width = frame.shape[:2]
+        if width <= target_w and height <= target_h:
+            return frame
+        return cv2.resize(frame, (target_w, target_h), interpolation=cv2.INTER_AREA)
+
+    def is_static_frame(self, frame):
+        """True if frame differs from the previous one by less than motion_threshold.
+
+        Compares mean absolute difference of 64x64 greyscale thumbnails
+        (0-255 scale), which costs far less than a full JPEG encode + upload.
+        """
+        if not self.motion_threshold:
+            return False
+        thumb = cv2.cvtColor(cv2.resize(frame, (64, 64), interpolation=cv2.INTER_AREA),
+                             cv2.COLOR_BGR2GRAY)
+        prev, self._prev_thumb = self._prev_thumb, thumb
+        if prev is None:
+            return False
+        return cv2.mean(cv2.absdiff(thumb, prev))[0] < self.motion_threshold
+
+    def select_jpeg_quality(self):
+        """JPEG quality for the next frame, lowered while the upload backlog grows"""
+        if not self.adaptive_quality:
+            return self.jpeg_quality
+
+        backlog = self.upload_queue.qsize()
+        if backlog < 10:
+            quality = self.jpeg_quality
+        elif backlog < 50:
+            quality = min(self.jpeg_quality, 80)
+        else:
+            quality = min(self.jpeg_quality, 65)
+
+        if quality != self._current_quality:
+            self.logger.info(f"Camera {self.camera_id}: JPEG quality {self._current_quality} -> {quality} "
+                             f"(upload backlog {backlog})")
+            self._current_quality = quality
+        return quality
+
+    def encode_frame(self, frame, quality=None):
+        """Encode a BGR frame as JPEG, using libjpeg-turbo (simplejpeg) when installed.
+
+        Returns a bytes-like object: bytes from simplejpeg, or a zero-copy
+        memoryview over cv2's output buffer. File writes and requests'
+        multipart encoder both accept either.
+        """
+        if quality is None:
+            quality = self.jpeg_quality
+
+        if simplejpeg is not None:
+            if not frame.flags['C_CONTIGUOUS']:
+                frame = np.ascontiguousarray(frame)
+            return simplejpeg.encode_jpeg(frame, quality=quality, colorspace='BGR', fastdct=True)
+
+        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        return buffer.data
+
+    @staticmethod
+    def brightness_avg(frame):
+        """Mean pixel value over every 4th row/column, via cv2.mean's SIMD reduction"""
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+        return round(sum(cv2.mean(frame[::4, ::4])[:channels]) / channels, 1)
+
+    def format_timestamp(self, captured_at):
+        """Return (timestamp, utc_offset, repeat) for a capture time.
+
+        Strings are cached per whole second; repeat counts earlier captures
+        in the same second so their filenames can be kept distinct.
+        """
+        second = int(captured_at)
+        if second != self._ts_second:
+            local_now = time.localtime(second)
+            self._ts_second = second
+            self._ts_string = time.strftime("%Y-%m-%d_%H-%M-%S", local_now)
+            self._ts_zone = time.strftime('%z', local_now)
+            self._ts_repeat = 0
+        else:
+            self._ts_repeat += 1
+        return self._ts_string, self._ts_zone, self._ts_repeat
+
+    def process_frame(self, frame, captured_at):
+        """Overlay, encode, store and queue a captured frame for upload"""
+        # Downscale first so overlay and JPEG encode work on fewer pixels
+        frame = self.downscale_frame(frame)
+
+        # Add timestamp and camera ID overlay
+        timestamp, utc_offset, repeat = self.format_timestamp(captured_at)
+        if self.overlay_timestamp:
+            cv2.putText(frame, f"{self.camera_id}: {timestamp}", self.overlay_origin,
+                        OVERLAY_FONT, self.overlay_font_scale, OVERLAY_COLOR, self.overlay_thickness)
+
+        quality = self.select_jpeg_quality()
+
+        # Build rich metadata for ML training
+        metadata = {
+            # Core identification (existing fields)
+            'timestamp': timestamp,
+            **self._metadata_identity,
+
+            # Device context
+            'device': {
+                'uptime_seconds': round(captured_at - self._start_time, 1),
+                'description': self._device_description,
+            },
+
+            # System metrics at capture time
+            'system': self.metrics_sampler.snapshot(),
+
+            # Camera context
+            'camera': self._metadata_camera,
+
+            # Image quality hints
+            'image': {
+                'brightness_avg': self.brightness_avg(frame),
+                'dimensions': [frame.shape[1], frame.shape[0]],
+                'jpeg_quality': quality,
+            },
+
+            # Environmental context
+            'environment': {
+                'capture_time_utc': datetime.utcfromtimestamp(captured_at).isoformat() + 'Z',
+                'timezone': utc_offset,
+            },
+        }
+
+        # Encode image
+        image_data = self.encode_frame(frame, quality)
+        # Content hash for integrity checks and dedup downstream
+        metadata['image']['sha256'] = hashlib.sha256(image_data).hexdigest()
+
+        # Store and queue for upload
+        filename = f"{self.camera_id}_{timestamp}.jpg" if not repeat else f"{self.camera_id}_{timestamp}_{repeat}.jpg"
+        # Skip formatting the size when DEBUG is filtered (the production default)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Camera {self.camera_id}: Captured {filename} ({len(image_data) / 1024:.1f}KB)")
+
+        self.storage_manager.store_image_async(image_data, filename, metadata)
+        self.upload_queue.put((filename, self.camera_id))
+
+    def _process_frame_logged(self, frame, captured_at):
+        """process_frame for the worker thread, where exceptions would otherwise vanish"""
         try:
-            temps = psutil.sensors_temperatures()
-            if temps:
-                # Try common thermal zone names
-                for zone in ['cpu_thermal', 'coretemp', 'cpu-thermal', 'soc_thermal']:
-                    if zone in temps and temps[zone]:
-                        return round(temps[zone][0].current, 1)
-                # Return first available temperature
-                for zone, entries in temps.items():
-                    if entries:
-                        return round(entries[0].current, 1)
-        except Exception:
-            pass
-        return None
+            self.process_frame(frame, captured_at)
+        except Exception as e:
+            self.logger.error(f"Camera {self.camera_id}: Frame processing failed: {str(e)}", exc_info=True)
 
     def capture_images(self):
         """Capture images from this specific camera with backoff for failures"""
         polling_interval = self.global_config.get('advanced', {}).get('polling_interval', 0.1)
 
+        # The idle path below runs every polling_interval; bind its lookups once
+        now = time.time
+        sleep = time.sleep
+        should_attempt_capture = self.state_tracker.should_attempt_capture
+        force_capture_event = self.force_capture_event
+        capture_interval = self.capture_interval
+        # For RTSP cameras, still grab frames between captures to keep stream alive
+        # (unless the camera's own grab thread already drains the stream)
+        keep_alive = None
+        if (self.camera_type == 'rtsp' and hasattr(self.camera, 'grab_frame')
+                and not self.config.get('grab_thread', False)):
+            keep_alive = self.camera.grab_frame
+
         while self.running:
             try:
-                current_time = time.time()
+                current_time = now()
 
                 # Check if camera is in backoff period (offline/failing)
-                if not self.state_tracker.should_attempt_capture():
-                    # For RTSP cameras, still grab frames to keep stream alive
-                    if self.camera_type == 'rtsp' and hasattr(self.camera, 'grab_frame'):
-                        self.camera.grab_frame()
-                    time.sleep(polling_interval)
+                if not should_attempt_capture():
+                    if keep_alive:
+                        keep_alive()
+                    sleep(polling_interval)
                     continue
 
                 # Check for forced capture or scheduled capture
-                if self.force_capture_event.is_set():
-                    self.force_capture_event.clear()
+                forced = force_capture_event.is_set()
+                if forced:
+                    force_capture_event.clear()
                     self.logger.info(f"Camera {self.camera_id}: Force capture triggered")
                     # Fall through to capture
-                elif current_time - self.timestamp_last_image < self.capture_interval:
-                    # For RTSP cameras, grab frames to keep stream alive
-                    if self.camera_type == 'rtsp' and hasattr(self.camera, 'grab_frame'):
-                        self.camera.grab_frame()
-                    time.sleep(polling_interval)
+                elif current_time - self.timestamp_last_image < capture_interval:
+                    if keep_alive:
+                        keep_alive()
+                    sleep(polling_interval)
                     continue
 
                 # Capture frame using unified interface
@@ -133,72 +543,24 @@ class CameraInstance:
                         self.camera.reconnect()
                     # Sleep for backoff period
                     wait_time = min(self.state_tracker.time_until_next_attempt(), 10)
-                    time.sleep(max(wait_time, 1))
+                    sleep(max(wait_time, 1))
                     continue
 
                 # Success! Record it to reset backoff
                 self.state_tracker.record_success()
 
-                # Add timestamp and camera ID overlay
-                timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-                cv2.putText(frame, f"{self.camera_id}: {timestamp}", (10, 30),
-                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-
-                # Build rich metadata for ML training
-                metadata = {
-                    # Core identification (existing fields)
-                    'timestamp': timestamp,
-                    'device_id': self.global_config['device']['id'],
-                    'camera_id': self.camera_id,
-                    'location': self.global_config['device']['location'],
-                    'version': VERSION,
-                    'camera_type': self.camera_type,
-
-                    # Device context
-                    'device': {
-                        'uptime_seconds': round(time.time() - self.global_config.get('_start_time', time.time()), 1),
-                        'description': self.global_config['device'].get('description', ''),
-                    },
-
-                    # System metrics at capture time
-                    'system': {
-                        'cpu_percent': psutil.cpu_percent(),
-                        'memory_percent': round(psutil.virtual_memory().percent, 1),
-                        'disk_percent': round(psutil.disk_usage('/').percent, 1),
-                        'cpu_temp': self._get_cpu_temp(),
-                    },
-
-                    # Camera context
-                    'camera': {
-                        'capture_interval': self.capture_interval,
-                        'position': self.config.get('position', {}),
-                        'resolution': self.config.get('resolution', [1280, 720]),
-                    },
-
-                    # Image quality hints
-                    'image': {
-                        'brightness_avg': round(float(np.mean(frame)), 1),
-                        'dimensions': [frame.shape[1], frame.shape[0]],
-                    },
-
-                    # Environmental context
-                    'environment': {
-                        'capture_time_utc': datetime.utcnow().isoformat() + 'Z',
-                        'timezone': time.strftime('%z'),
-                    },
-                }
-
-                # Encode image
-                _, buffer = cv2.imencode('.jpg', frame)
-                image_data = buffer.tobytes()
-
-                # Store and queue for upload
-                filename = f"{self.camera_id}_{timestamp}.jpg"
-                img_size = len(image_data) / 1024
-                self.logger.debug(f"Camera {self.camera_id}: Captured {filename} ({img_size:.1f}KB)")
+                # Unchanged scene: skip encode and upload until the next interval
+                if not forced and self.is_static_frame(frame):
+                    self.timestamp_last_image = current_time
+                    self.logger.debug(f"Camera {self.camera_id}: Scene unchanged, skipping capture")
+                    continue
 
-                self.storage_manager.store_image(image_data, filename, metadata)
-                self.upload_queue.put((filename, image_data, metadata, self.camera_id))
+                if self._process_executor is None:
+                    self.process_frame(frame, current_time)
+                elif self._pending_process is not None and not self._pending_process.done():
+                    self.logger.warning(f"Camera {self.camera_id}: Previous frame still processing, dropping this one")
+                else:
+                    self._pending_process = self._process_executor.submit(self._process_frame_logged, frame, current_time)
 
                 # Update timestamp for next capture
                 self.timestamp_last_image = current_time
@@ -213,7 +575,13 @@ class CameraInstance:
     def stop(self):
         """Stop this camera instance using new architecture"""
         self.running = False
-        
+
+        # Let an in-flight frame finish storing before the camera goes away
+        if self._pending_process is not None:
+            wait_futures([self._pending_process])
+        if self._owns_process_executor:
+            self._process_executor.shutdown(wait=True)
+
         # Use new camera cleanup method
         self.camera.cleanup()
         
@@ -227,11 +595,19 @@ class CameraService:
         self.camera_instances = {}
         self.camera_threads = {}
         self.failed_cameras = {}  # Track cameras that failed initialization: {cam_id: (config, attempts, next_retry_time)}
+        self._retry_heap = []  # (next_retry_time, cam_id); stale entries are skipped when popped
+        self._retry_lock = Lock()
+        self._retry_wakeup = Event()
+        self._command_lock = Lock()  # Serializes health socket commands
+        self._health_cache = (0.0, None)  # (monotonic time, encoded health data)
+        self._health_cache_lock = Lock()
         self.load_config()
         self.setup_logging()
+        self.setup_opencv()
         self.setup_storage()
         self.setup_queues()
         self.setup_ssl()
+        self.setup_http_session()
         self.setup_cameras()
         self.setup_monitoring()
         self.setup_watchdog()
@@ -240,7 +616,7 @@ class CameraService:
         """Load configuration from YAML file"""
         try:
             with open(self.config_path, 'r') as file:
-                self.config = yaml.safe_load(file)
+                self.config = yaml.load(file, Loader=_YamlLoader)
             # Track service start time for uptime calculation in metadata
             self.config['_start_time'] = time.time()
         except Exception as e:
@@ -302,6 +678,23 @@ class CameraService:
             handler.setLevel(level)
         self.logger.warning(f"Initialization complete - log level now {self._configured_log_level}")
 
+    def setup_opencv(self):
+        """Select OpenCV's SIMD kernels and cap its internal thread pool.
+
+        Each camera already has its own capture thread, so per-call OpenCV
+        worker pools only add fork/join overhead on small boards. 'auto'
+        splits the cores evenly across the configured cameras instead.
+        """
+        threads = self.config.get('advanced', {}).get('opencv_threads', 1)
+        if threads == 'auto':
+            camera_count = max(1, len(self.config.get('cameras', [])))
+            threads = max(1, (os.cpu_count() or 1) // camera_count)
+        cv2.setUseOptimized(True)
+        cv2.setNumThreads(threads)
+        self.logger.debug(f"OpenCV optimized={cv2.useOptimized()} threads={threads}")
+        encoder = 'simplejpeg (libjpeg-turbo)' if simplejpeg is not None else 'cv2.imencode'
+        self.logger.info(f"JPEG encoder: {encoder}")
+
     def setup_storage(self):
         """Initialize local storage system"""
         storage_config = self.config['storage']
@@ -314,15 +707,37 @@ class CameraService:
             max_size_gb=storage_config['max_size_gb'],
             cleanup_threshold_gb=storage_config['cleanup_threshold_gb'],
             retention_days=storage_config['retention_days'],
-            logger=self.logger
+            logger=self.logger,
+            async_writes=storage_config.get('async_writes', False)
         )
 
     def setup_queues(self):
         """Initialize queue system for image processing"""
         self.image_queue = Queue(maxsize=100)
-        self.upload_queue = Queue(maxsize=1000)
+        # Entries are (filename, camera_id); the bytes stay on disk until upload
+        self.upload_queue = UploadQueue(maxsize=100000)
+        # Shared overlay/encode/store workers for cameras with process_in_worker
+        # (threads are only started once a camera submits work)
+        advanced = self.config.get('advanced', {})
+        process_workers = advanced.get('process_workers', 2)
+        # Optionally keep encodes on their own cores, away from capture/grab threads
+        process_cpus = advanced.get('process_cpus')
+        pool_kwargs = {}
+        if process_cpus:
+            pool_kwargs = {'initializer': self._pin_process_worker, 'initargs': (set(process_cpus),)}
+        self.process_pool = ThreadPoolExecutor(max_workers=max(1, int(process_workers)),
+                                               thread_name_prefix="FrameProcess", **pool_kwargs)
+        # Capture metadata's system metrics, shared so cameras don't each re-sample psutil
+        self.metrics_sampler = SystemMetricsSampler()
         self.running = True
 
+    def _pin_process_worker(self, cpus):
+        """Pool initializer: restrict the calling FrameProcess thread to cpus (Linux)"""
+        try:
+            os.sched_setaffinity(0, cpus)
+        except (AttributeError, OSError, ValueError) as e:
+            self.logger.warning(f"Could not pin frame-processing thread to CPUs {sorted(cpus)}: {e}")
+
     def setup_ssl(self):
         """Configure SSL context for secure communications"""
         self.ssl_context = ssl.create_default_context()
@@ -332,6 +747,54 @@ class CameraService:
                 self.config['server']['cert_path']
             )
 
+    def setup_http_session(self):
+        """Create a pooled keep-alive HTTP session shared by all uploads"""
+        server = self.config['server']
+        self.upload_workers = max(1, int(server.get('upload_workers', 1)))
+
+        # Optional HTTP/2: all upload workers multiplex their POSTs over one connection
+        self._http2 = False
+        if server.get('http2', False):
+            if httpx is None:
+                self.logger.warning("server.http2 is set but httpx is not installed, using HTTP/1.1")
+            else:
+                try:
+                    self.session = httpx.Client(http2=True, verify=server['ssl_verify'],
+                                                limits=httpx.Limits(max_connections=max(4, self.upload_workers)))
+                except ImportError:
+                    # Plain `pip install httpx` lacks the h2 package behind http2=True
+                    self.logger.warning("server.http2 is set but httpx[http2] (h2) is not installed, using HTTP/1.1")
+                else:
+                    self._http2 = True
+                    self._refresh_upload_settings()
+                    self.logger.info("Uploads using HTTP/2 (httpx)")
+                    return
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(4, self.upload_workers),
+            # Retry only failed connects: the streamed multipart body can't be
+            # rewound, so a resent POST would go out empty. Gateway errors and
+            # read failures fall through to upload_images' requeue and backoff.
+            max_retries=Retry(total=2, connect=2, read=0, status=0, other=0,
+                              backoff_factor=0.3, raise_on_status=False)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._refresh_upload_settings()
+
+    def _refresh_upload_settings(self):
+        """Snapshot server settings for upload workers (re-run on SIGHUP reload)"""
+        server = self.config['server']
+        self._upload_settings = {
+            'url': server['url'],
+            'verify': server['ssl_verify'],
+            'timeout': server['timeout'],
+            'headers': {"Authorization": f"Bearer {server['auth_token']}"},
+            'batch_max': server.get('upload_batch_max', 1),
+        }
+
     def setup_cameras(self):
         """Initialize and configure all cameras from config"""
         try:
@@ -407,7 +870,9 @@ class CameraService:
                 global_config=self.config,
                 logger=self.logger,
                 storage_manager=self.storage_manager,
-                upload_queue=self.upload_queue
+                upload_queue=self.upload_queue,
+                process_pool=self.process_pool,
+                metrics_sampler=self.metrics_sampler
             )
 
             # Initialize camera
@@ -445,32 +910,46 @@ class CameraService:
         next_retry = time.time() + retry_interval
 
         self.failed_cameras[cam_id] = (cam_config, attempts, next_retry)
+        self._schedule_retry(cam_id, next_retry)
         self.logger.warning(
             f"Camera {cam_id}: Failed to initialize (attempt {attempts}), "
             f"will retry in {retry_interval}s ({multiplier}x interval)"
         )
 
+    def _schedule_retry(self, cam_id: str, next_retry: float):
+        """Queue a retry deadline and wake the retry thread if it is sleeping."""
+        with self._retry_lock:
+            heapq.heappush(self._retry_heap, (next_retry, cam_id))
+        self._retry_wakeup.set()
+
+    def _pop_due_retries(self, now: float) -> list:
+        """Pop every camera whose retry deadline has passed.
+
+        Entries superseded by a later reschedule, or for cameras that have
+        since recovered, no longer match failed_cameras and are dropped.
+        """
+        due = []
+        with self._retry_lock:
+            while self._retry_heap and self._retry_heap[0][0] <= now:
+                next_retry, cam_id = heapq.heappop(self._retry_heap)
+                entry = self.failed_cameras.get(cam_id)
+                if entry is not None and entry[2] == next_retry:
+                    due.append((cam_id, entry[0]))
+        return due
+
     def retry_failed_cameras(self):
-        """Periodically retry initializing failed cameras."""
+        """Retry initializing failed cameras as their backoff deadlines expire."""
         # Use rate-limited logger for status updates
         rl_logger = RateLimitedLogger(self.logger, default_interval=300)
 
         while self.running:
             try:
-                if not self.failed_cameras:
-                    time.sleep(30)
-                    continue
-
-                now = time.time()
-                cameras_to_retry = []
-
-                # Find cameras ready for retry
-                for cam_id, (cam_config, attempts, next_retry) in list(self.failed_cameras.items()):
-                    if now >= next_retry:
-                        cameras_to_retry.append((cam_id, cam_config))
+                # Clear before computing the timeout so a failure recorded
+                # meanwhile still wakes the wait below
+                self._retry_wakeup.clear()
 
                 # Retry each camera
-                for cam_id, cam_config in cameras_to_retry:
+                for cam_id, cam_config in self._pop_due_retries(time.time()):
                     if self._try_initialize_camera(cam_id, cam_config, is_retry=True):
                         # Start capture thread for newly initialized camera
                         if cam_id in self.camera_instances:
@@ -492,7 +971,11 @@ class CameraService:
                         key="failed_cameras_status"
                     )
 
-                time.sleep(10)  # Check every 10 seconds
+                # Sleep until the earliest deadline (or until a new failure is queued)
+                with self._retry_lock:
+                    timeout = self._retry_heap[0][0] - time.time() if self._retry_heap else None
+                if timeout is None or timeout > 0:
+                    self._retry_wakeup.wait(timeout)
 
             except Exception as e:
                 self.logger.error(f"Camera retry thread error: {str(e)}", exc_info=True)
@@ -522,70 +1005,161 @@ class CameraService:
                 self.start_capture_threads()
             time.sleep(10)
 
-    def compress_image(self, image_data):
-        """Compress image data if needed"""
-        # For simple implementation, just return the data
-        # For better performance, could use PIL or other compression
-        return image_data
-
     def disable_upload(self):
         """Disable image upload for local testing"""
         self.upload_enabled = False
         self.logger.info("Upload disabled - running in local save mode")
 
+    def _multipart_kwargs(self, fields, headers):
+        """Build post() kwargs for a multipart body from (name, (filename, data, type)) fields.
+
+        With requests-toolbelt installed the body is streamed by
+        MultipartEncoder instead of being assembled in one extra buffer.
+        """
+        if MultipartEncoder is None and not self._http2:
+            return {'headers': headers, 'files': dict(fields)}
+
+        # MultipartEncoder and httpx only read str/bytes/file objects, not memoryviews
+        fields = [
+            (name, (part_name, data if isinstance(data, (bytes, str)) else bytes(data), content_type))
+            for name, (part_name, data, content_type) in fields
+        ]
+        if self._http2:
+            return {'headers': headers, 'files': dict(fields)}
+        encoder = MultipartEncoder(fields=fields)
+        return {'headers': {**headers, 'Content-Type': encoder.content_type}, 'data': encoder}
+
+    def _build_upload_body(self, filename, image_data, metadata_json, headers):
+        """Build post() kwargs for a single-image upload ('image' + 'metadata' parts).
+
+        metadata_json is the already-serialized sidecar as stored on disk.
+        """
+        return self._multipart_kwargs([
+            ('image', (filename, image_data, 'image/jpeg')),
+            ('metadata', ('metadata.json', metadata_json, 'application/json')),
+        ], headers)
+
+    def _build_batch_upload_body(self, items, headers):
+        """Build post() kwargs for a batched upload.
+
+        Batch contract: parts image_0..image_{N-1} carry the JPEGs and a single
+        'metadata' part holds a JSON array whose i-th entry describes image_i.
+        """
+        fields = [
+            (f'image_{i}', (filename, image_data, 'image/jpeg'))
+            for i, (filename, image_data, _metadata, _camera_id) in enumerate(items)
+        ]
+        # Splice the stored JSON documents into an array instead of re-serializing them
+        metadata_array = b'[' + b','.join(item[2] for item in items) + b']'
+        fields.append(('metadata', ('metadata.json', metadata_array, 'application/json')))
+        return self._multipart_kwargs(fields, headers)
+
     def upload_images(self):
         """Upload images to server"""
         if not self.upload_enabled:
             self.logger.info("Upload functionality disabled")
             return
 
+        backoff = 0  # Seconds to pause after a retryable failure, doubles up to 60
+
         while self.running:
+            items = []
             try:
-                if not self.upload_queue.empty():
-                    filename, image_data, metadata, camera_id = self.upload_queue.get()
-                    img_size = len(image_data) / 1024
-                    self.logger.debug(f"Camera {camera_id}: Uploading {filename} ({img_size:.1f}KB)")
-
-                    files = {
-                        'image': (filename, image_data, 'image/jpeg'),
-                        'metadata': ('metadata.json', json.dumps(metadata), 'application/json')
-                    }
-
-                    headers = {
-                        "Authorization": f"Bearer {self.config['server']['auth_token']}",
-                    }
-
-                    response = requests.post(
-                        self.config['server']['url'],
-                        headers=headers,
-                        files=files,
-                        verify=self.config['server']['ssl_verify'],
-                        timeout=self.config['server']['timeout']
-                    )
+                # Block until work arrives; the timeout only bounds shutdown latency
+                try:
+                    items = [self.upload_queue.get(timeout=1.0)]
+                except Empty:
+                    self._requeue_evicted()
+                    continue
+
+                # One read of the snapshot, so a reload mid-upload can't mix settings
+                settings = self._upload_settings
+
+                # Opportunistically batch whatever else is already queued
+                while len(items) < settings['batch_max']:
+                    try:
+                        items.append(self.upload_queue.get_nowait())
+                    except Empty:
+                        break
+
+                # The queue holds (filename, camera_id); image and metadata are read back from storage
+                uploads = []
+                for filename, camera_id in items:
+                    stored = self.storage_manager.load_pending(filename)
+                    if stored is None:
+                        self.logger.warning(f"Skipping upload of {filename}: no longer in storage")
+                        self.upload_queue.dropped += 1
+                        continue
+                    uploads.append((filename, *stored, camera_id))
+                if not uploads:
+                    continue
+
+                filenames = [upload[0] for upload in uploads]
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    img_size = sum(len(upload[1]) for upload in uploads) / 1024
+                    self.logger.debug(f"Camera {uploads[0][3]}: Uploading {', '.join(filenames)} ({img_size:.1f}KB)")
 
-                    if response.status_code == 200:
+                if len(uploads) == 1:
+                    body = self._build_upload_body(*uploads[0][:3], settings['headers'])
+                else:
+                    body = self._build_batch_upload_body(uploads, settings['headers'])
+
+                if not self._http2:
+                    body['verify'] = settings['verify']  # httpx fixes verify on the client
+                response = self.session.post(settings['url'], timeout=settings['timeout'], **body)
+
+                if response.status_code == 200:
+                    for filename in filenames:
                         self.storage_manager.mark_as_uploaded(filename)
-                        response_time = response.elapsed.total_seconds()
-                        self.logger.debug(f"Uploaded {filename} ({response_time:.2f}s)")
-                    else:
-                        self.logger.error(f"Upload failed for {filename}: HTTP {response.status_code} - {response.text[:100]}")
+                    response_time = response.elapsed.total_seconds()
+                    self.logger.debug(f"Uploaded {len(filenames)} image(s) ({response_time:.2f}s)")
+                    backoff = 0
+                    continue
 
-                time.sleep(0.1)
+                # Only the first 100 bytes are logged; skip decoding the whole body
+                snippet = response.content[:100].decode('utf-8', errors='replace')
+                self.logger.error(f"Upload failed for {', '.join(filenames)}: HTTP {response.status_code} - {snippet}")
+                if response.status_code != 429 and response.status_code < 500:
+                    continue  # Client error: resending the same body will not help
             except Exception as e:
                 self.logger.error(f"Upload error: {str(e)}", exc_info=True)
-                time.sleep(1)
+
+            # Server/network trouble: put the images back and back off before retrying
+            for item in items:
+                self.upload_queue.put(item)
+            backoff = min(max(1, backoff * 2), 60)
+            time.sleep(backoff)
+
+    def _requeue_evicted(self):
+        """Queue stored images again after a full upload queue evicted some
+
+        Called when the queue has drained. Evicted images are still in the
+        storage manager's pending index, so the oldest of them (up to a
+        queue's worth) are queued again; a further overflow is picked up on
+        the next drain.
+        """
+        if not self.upload_queue.take_overflow():
+            return
+        filenames = self.storage_manager.pending_filenames(self.upload_queue.maxsize)
+        for filename in filenames:
+            match = _CAPTURE_NAME_RE.fullmatch(filename)
+            self.upload_queue.put((filename, match.group(1) if match else 'unknown'))
+        if filenames:
+            self.logger.info(f"Re-queued {len(filenames)} stored image(s) evicted from the upload queue")
 
     def setup_monitoring(self):
         """Initialize system monitoring"""
         self.health_monitor = HealthMonitor(
             self.config['monitoring'],
             self.logger,
-            self.restart_service
+            self.restart_service,
+            metrics_sampler=self.metrics_sampler
         )
 
     def setup_watchdog(self):
         """Configure systemd watchdog integration"""
         self.watchdog_usec = int(os.environ.get('WATCHDOG_USEC', 0))
+        self._last_watchdog_ping = 0.0  # time.monotonic() of the last WATCHDOG=1
         if self.watchdog_usec:
             self.logger.info(f"Watchdog enabled with {self.watchdog_usec/1000000}s timeout")
             daemon.notify('READY=1')
@@ -593,15 +1167,14 @@ class CameraService:
             self.logger.info("Watchdog not enabled")
 
     def send_watchdog_notification(self):
-        """Send heartbeat to systemd watchdog"""
-        if self.watchdog_usec:
-            daemon.notify('WATCHDOG=1')
-
-    def watchdog_loop(self):
-        """Dedicated thread for watchdog notifications"""
-        while self.running:
-            self.send_watchdog_notification()
-            time.sleep(self.watchdog_usec/2000000)  # Sleep for half the timeout period
+        """Send heartbeat to systemd watchdog, skipping it if one went out in the last quarter timeout"""
+        if not self.watchdog_usec:
+            return
+        now = time.monotonic()
+        if now - self._last_watchdog_ping < self.watchdog_usec / 4000000:
+            return
+        daemon.notify('WATCHDOG=1')
+        self._last_watchdog_ping = now
 
     def run(self):
         """Main service run method"""
@@ -610,15 +1183,15 @@ class CameraService:
 
         threads = [
             Thread(target=self.capture_images, name="CaptureCoordinator"),
-            Thread(target=self.upload_images, name="UploadProcessor"),
             Thread(target=self.health_monitor.run, name="HealthMonitor"),
-            Thread(target=self.storage_manager.run_cleanup_thread, name="StorageManager"),
             Thread(target=self.retry_failed_cameras, name="CameraRetry"),
             Thread(target=self.health_socket_server, name="HealthSocket"),
         ]
 
-        if self.watchdog_usec:
-            threads.append(Thread(target=self.watchdog_loop, name="WatchdogNotifier"))
+        # Several upload workers keep multiple POSTs in flight on slow links
+        for i in range(self.upload_workers):
+            name = "UploadProcessor" if i == 0 else f"UploadProcessor-{i}"
+            threads.append(Thread(target=self.upload_images, name=name))
 
         for thread in threads:
             thread.daemon = True  # Ensure threads terminate with main process
@@ -630,9 +1203,12 @@ class CameraService:
             signal.signal(signal.SIGINT, self.handle_shutdown)
             signal.signal(signal.SIGHUP, self.handle_reload)
 
-            # Keep main thread alive
+            # Keep main thread alive; it also carries the systemd watchdog
+            # heartbeat, ticking fast enough that pings stay within timeout/2
+            tick = min(1.0, self.watchdog_usec / 4000000) if self.watchdog_usec else 1.0
             while self.running:
-                time.sleep(1)
+                self.send_watchdog_notification()
+                time.sleep(tick)
 
         except KeyboardInterrupt:
             self.cleanup()
@@ -641,6 +1217,7 @@ class CameraService:
         """Handle shutdown signals gracefully"""
         self.logger.info(f"Received signal {signum}, initiating shutdown...")
         self.cleanup()
+        sys.exit(0)
 
     def handle_reload(self, signum, frame):
         """Handle SIGHUP for config hot-reload"""
@@ -649,7 +1226,7 @@ class CameraService:
         try:
             # Load new config
             with open(self.config_path, 'r') as file:
-                new_config = yaml.safe_load(file)
+                new_config = yaml.load(file, Loader=_YamlLoader)
         except Exception as e:
             self.logger.error(f"Failed to reload config: {e}")
             return
@@ -677,7 +1254,7 @@ class CameraService:
                 self.health_monitor.config[key] = new_val
                 changes.append(f"monitoring.{key}: {old_val} -> {new_val}")
 
-        # 3. Server settings (safe to reload - used per-upload)
+        # 3. Server settings (safe to reload - upload settings are re-snapshotted below)
         for key in ['url', 'auth_token', 'timeout', 'ssl_verify']:
             new_val = new_config.get('server', {}).get(key)
             old_val = old_config.get('server', {}).get(key)
@@ -702,12 +1279,20 @@ class CameraService:
             restart_required.append('network')
         if new_config.get('device') != old_config.get('device'):
             restart_required.append('device')
+        if new_config.get('server', {}).get('http2', False) != old_config.get('server', {}).get('http2', False):
+            restart_required.append('server.http2')
+        elif self._http2 and new_config.get('server', {}).get('ssl_verify') != old_config.get('server', {}).get('ssl_verify'):
+            restart_required.append('server.ssl_verify')
+        if (new_config.get('monitoring', {}).get('health_socket_uids')
+                != old_config.get('monitoring', {}).get('health_socket_uids')):
+            restart_required.append('monitoring.health_socket_uids')
 
         # Preserve _start_time from original config
         new_config['_start_time'] = old_config.get('_start_time', time.time())
 
         # Update config reference
         self.config = new_config
+        self._refresh_upload_settings()
 
         # Log results
         if changes:
@@ -737,13 +1322,14 @@ class CameraService:
             self.logger.warning(f"Cannot create {socket_dir}, health socket disabled")
             return
 
-        # Remove stale socket file
-        if os.path.exists(socket_path):
-            try:
-                os.unlink(socket_path)
-            except Exception as e:
-                self.logger.warning(f"Cannot remove stale socket {socket_path}: {e}")
-                return
+        # Remove stale socket file (unlink directly; no exists() check to race with)
+        try:
+            os.unlink(socket_path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"Cannot remove stale socket {socket_path}: {e}")
+            return
 
         try:
             server = sock.socket(sock.AF_UNIX, sock.SOCK_STREAM)
@@ -756,30 +1342,21 @@ class CameraService:
             self.logger.warning(f"Failed to start health socket server: {e}")
             return
 
+        # Optional peer allowlist: the service's own user and root always pass
+        allowed_uids = self.config.get('monitoring', {}).get('health_socket_uids')
+        if allowed_uids is not None:
+            allowed_uids = set(allowed_uids) | {os.getuid(), 0}
+
         while self.running:
             try:
                 conn, _ = server.accept()
-                try:
-                    # Try to read a command from the client
-                    conn.settimeout(0.5)
-                    try:
-                        request_data = conn.recv(4096).decode('utf-8').strip()
-                    except sock.timeout:
-                        request_data = ''
-
-                    if not request_data:
-                        # Backward compat: return health data
-                        response = json.dumps(self._get_health_data())
-                    else:
-                        try:
-                            cmd = json.loads(request_data)
-                            response = json.dumps(self._handle_command(cmd))
-                        except Exception as e:
-                            response = json.dumps({'error': str(e)})
-
-                    conn.sendall(response.encode('utf-8'))
-                finally:
+                if allowed_uids is not None and not self._health_peer_allowed(conn, allowed_uids):
                     conn.close()
+                    continue
+                # One thread per client so a slow or silent client doesn't
+                # hold up the next one while its command read times out
+                Thread(target=self._serve_health_connection, args=(conn,),
+                       name="HealthSocketConn", daemon=True).start()
             except sock.timeout:
                 continue
             except Exception as e:
@@ -788,24 +1365,87 @@ class CameraService:
         # Cleanup on shutdown
         try:
             server.close()
-            if os.path.exists(socket_path):
-                os.unlink(socket_path)
+            os.unlink(socket_path)
         except Exception:
             pass
 
+    def _health_peer_allowed(self, conn, allowed_uids):
+        """Check the connecting process's uid (SO_PEERCRED) before doing any work for it"""
+        import socket as sock
+
+        try:
+            creds = conn.getsockopt(sock.SOL_SOCKET, sock.SO_PEERCRED, struct.calcsize('3i'))
+        except (AttributeError, OSError) as e:
+            self.logger.debug(f"Health socket: cannot read peer credentials: {e}")
+            return False
+        pid, uid, _ = struct.unpack('3i', creds)
+        if uid in allowed_uids:
+            return True
+        self.logger.debug(f"Health socket: rejected pid {pid} (uid {uid})")
+        return False
+
+    def _serve_health_connection(self, conn):
+        """Answer one health socket client: a JSON command, or health data if it sends none"""
+        import socket as sock
+
+        try:
+            # Try to read a command from the client
+            conn.settimeout(0.5)
+            try:
+                request_data = conn.recv(4096).decode('utf-8').strip()
+            except sock.timeout:
+                request_data = ''
+
+            if not request_data:
+                # Backward compat: return health data
+                response = self._get_health_bytes()
+            else:
+                try:
+                    cmd = json.loads(request_data)
+                    # Commands (restarts, captures) still run one at a time
+                    with self._command_lock:
+                        response = json.dumps(self._handle_command(cmd)).encode('utf-8')
+                    self._health_cache = (0.0, None)  # Camera state may have changed
+                except Exception as e:
+                    response = json.dumps({'error': str(e)}).encode('utf-8')
+
+            conn.sendall(response)
+        except Exception as e:
+            self.logger.debug(f"Health socket error: {e}")
+        finally:
+            conn.close()
+
+    def _get_health_bytes(self):
+        """Encoded _get_health_data(), shared by clients within HEALTH_CACHE_TTL"""
+        with self._health_cache_lock:
+            cached_at, payload = self._health_cache
+            now = time.monotonic()
+            if payload is None or now - cached_at >= HEALTH_CACHE_TTL:
+                payload = dumps_json(self._get_health_data())
+                if isinstance(payload, str):
+                    payload = payload.encode()
+                self._health_cache = (now, payload)
+            return payload
+
     def _get_health_data(self):
         """Collect current health state for socket response"""
+        system = self.metrics_sampler.snapshot()
+        # is_alive() takes a lock; ask each thread once and reuse the answer
+        threads_alive = {cam_id: t is not None and t.is_alive() for cam_id, t in self.camera_threads.items()}
+        # get_status() builds a fresh dict per call, so extend it in place
+        cameras = {}
+        for cam_id, instance in self.camera_instances.items():
+            status = instance.state_tracker.get_status()
+            status['thread_alive'] = threads_alive.get(cam_id, False)
+            cameras[cam_id] = status
         return {
             'timestamp': datetime.now().isoformat(),
             'version': VERSION,
             'uptime_seconds': round(time.time() - self.config.get('_start_time', time.time()), 1),
 
-            # System metrics
-            'system': {
-                'cpu_percent': psutil.cpu_percent(),
-                'memory_percent': round(psutil.virtual_memory().percent, 1),
-                'disk_percent': round(psutil.disk_usage('/').percent, 1),
-            },
+            # System metrics, from the sampler shared with capture metadata
+            # so polling clients don't each hit /proc and statvfs
+            'system': {key: system[key] for key in ('cpu_percent', 'memory_percent', 'disk_percent')},
 
             # Health monitor metrics
             'health_monitor': {
@@ -815,25 +1455,21 @@ class CameraService:
                 'last_check': self.health_monitor.metrics.get('last_check', 0),
             },
 
+            # Upload backlog; dropped counts entries evicted from a full queue
+            'upload_queue': {
+                'pending': self.upload_queue.qsize(),
+                'dropped': self.upload_queue.dropped,
+            },
+
             # Thread health
             'threads': {
-                'total': len(self.camera_threads),
-                'alive': sum(1 for t in self.camera_threads.values() if t.is_alive()),
-                'cameras': {
-                    cam_id: t.is_alive() if t else False
-                    for cam_id, t in self.camera_threads.items()
-                }
+                'total': len(threads_alive),
+                'alive': sum(threads_alive.values()),
+                'cameras': threads_alive,
             },
 
             # Per-camera state from CameraStateTracker
-            'cameras': {
-                cam_id: {
-                    **instance.state_tracker.get_status(),
-                    'thread_alive': self.camera_threads.get(cam_id) is not None
-                        and self.camera_threads[cam_id].is_alive(),
-                }
-                for cam_id, instance in self.camera_instances.items()
-            },
+            'cameras': cameras,
 
             # Failed cameras pending retry
             'failed_cameras': {
@@ -874,6 +1510,7 @@ class CameraService:
                 # Force immediate retry by resetting next_retry time
                 config, attempts, _ = self.failed_cameras[cam_id]
                 self.failed_cameras[cam_id] = (config, 0, 0)
+                self._schedule_retry(cam_id, 0)
                 return {'ok': True, 'camera_id': cam_id, 'action': 'retry_queued'}
             return {'error': f'Camera {cam_id} not found'}
 
@@ -910,49 +1547,138 @@ class CameraService:
             self.logger.info(f"Stopping camera {cam_id}")
             instance.stop()
 
+        self.process_pool.shutdown(wait=True)
+        self.session.close()
+        self.storage_manager.close()
+
         self.logger.info("Service stopped")
-        sys.exit(0)
 
     def restart_service(self):
-        """Restart the service"""
+        """Restart the service
+
+        Under systemd, exit non-zero and let Restart= start a fresh process in
+        the same unit; otherwise re-exec the interpreter in place.
+        """
         self.logger.info("Restarting service...")
+        under_systemd = bool(os.environ.get('INVOCATION_ID') or os.environ.get('NOTIFY_SOCKET'))
+        if under_systemd:
+            daemon.notify('STOPPING=1')
         self.cleanup()
-        os.execv(sys.executable, ['python'] + sys.argv)
+
+        if under_systemd:
+            # Called from the health monitor thread, where sys.exit would only
+            # end that thread; flush logs and take the whole process down
+            logging.shutdown()
+            os._exit(1)
+        else:
+            os.execv(sys.executable, ['python'] + sys.argv)
 
 class StorageManager:
+    # Threshold cleanups are checked on every stored frame; schedule at most this often
+    CLEANUP_MIN_INTERVAL = 60
+    # Images whose local write failed are kept in memory for upload, up to this many
+    UNSTORED_MAX_IMAGES = 50
+
     def __init__(self, base_path, max_size_gb, cleanup_threshold_gb,
-                 retention_days, logger):
+                 retention_days, logger, async_writes=False):
         """Initialize the storage manager"""
         self.base_path = Path(base_path)
         self.max_size_gb = max_size_gb
         self.cleanup_threshold_gb = cleanup_threshold_gb
         self.retention_days = retention_days
         self.logger = logger
-        self.running = True
         self._cleanup_lock = Lock()  # Prevent concurrent cleanup operations
 
+        # Cleanup runs here when a store pushes usage past cleanup_threshold_gb
+        self._cleanup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="StorageCleanup")
+        self._cleanup_future = None
+        self._cleanup_scheduled_at = float('-inf')  # monotonic time of the last threshold cleanup
+
+        # Optional writer thread so SD-card writes don't stall capture threads
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="StorageWriter") if async_writes else None
+        self._pending_writes = {}  # filename -> Future of an in-flight store_image
+        # filename -> (image_data, metadata) of images that failed to reach disk,
+        # oldest first; guarded by _pending_lock
+        self._unstored = OrderedDict()
+        self._pending_lock = Lock()
+
         # Create storage directories
         self.uploaded_path = self.base_path / 'uploaded'
         self.uploaded_path.mkdir(parents=True, exist_ok=True)
+        self.uploaded_metadata_path = self.uploaded_path / 'metadata'
+        self.uploaded_metadata_path.mkdir(exist_ok=True)
 
         # Initialize metadata storage
         self.metadata_path = self.base_path / 'metadata'
         self.metadata_path.mkdir(parents=True, exist_ok=True)
 
-    def get_current_size_gb(self):
-        """Calculate current storage usage"""
+        # Running byte count of the storage tree: one full scan here, then
+        # updated on store/cleanup so the per-frame limit check is O(1).
+        self._size_lock = Lock()
+        self._current_bytes = self._scan_size_bytes()
+
+        # Indexes of images (filename -> (mtime, size)) ordered by store time,
+        # oldest first, so cleanup pops only what it deletes instead of
+        # listing directories. The uploaded index keeps store-time order even
+        # when uploads complete out of order (see _insert_by_mtime).
+        # Guarded by _size_lock together with the byte counter.
+        self._pending_index = OrderedDict(
+            (name, (mtime, size)) for _, name, mtime, size in self._list_jpegs_oldest_first(self.base_path))
+        self._uploaded_index = OrderedDict(
+            (name, (mtime, size)) for _, name, mtime, size in self._list_jpegs_oldest_first(self.uploaded_path))
+
+    def _scan_size_bytes(self):
+        """Walk the storage tree and sum file sizes"""
         try:
-            def _safe_size(f):
-                try:
-                    return f.stat().st_size
-                except OSError:
-                    return 0
-            total_size = sum(_safe_size(f) for f in self.base_path.rglob('*') if f.is_file())
-            return total_size / (1024**3)  # Convert to GB
+            # scandir reports the entry type from readdir, so each file costs one stat
+            total = 0
+            pending = [self.base_path]
+            while pending:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                            elif entry.is_file():
+                                total += entry.stat().st_size
+                        except OSError:
+                            continue
+            return total
         except Exception as e:
             self.logger.error(f"Error calculating storage size: {e}")
             return 0
 
+    @staticmethod
+    def _list_jpegs_oldest_first(directory):
+        """(path, name, mtime, size) for each *.jpg in directory, oldest first, from one scandir pass"""
+        files = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.jpg'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # File deleted or inode corrupted — skip
+                files.append((entry.path, entry.name, stat.st_mtime, stat.st_size))
+        files.sort(key=lambda x: x[2])
+        return files
+
+    @staticmethod
+    def _write_file(path, data):
+        """Write a bytes-like object with raw os.write calls (no buffered file object)"""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+
+    def get_current_size_gb(self):
+        """Current storage usage from the running byte counter"""
+        return self._current_bytes / (1024**3)  # Convert to GB
+
     def store_image(self, image_data, filename, metadata=None):
         """Store image and its metadata"""
         try:
@@ -965,39 +1691,158 @@ class StorageManager:
 
             # Store image
             file_path = self.base_path / filename
-            with open(file_path, 'wb') as f:
-                f.write(image_data)
+            self._write_file(file_path, image_data)
+            written = len(image_data)
             self.logger.debug(f"Image saved to: {file_path}")
 
             # Store metadata if provided
             if metadata:
                 metadata_file = self.metadata_path / f"{filename}.json"
-                with open(metadata_file, 'w') as f:
-                    json.dump(metadata, f)
+                metadata_json = dumps_json(metadata)
+                if isinstance(metadata_json, str):
+                    metadata_json = metadata_json.encode()
+                self._write_file(metadata_file, metadata_json)
+                written += len(metadata_json)
                 self.logger.debug(f"Metadata saved to: {metadata_file}")
 
-            img_size = len(image_data) / 1024
-            self.logger.debug(f"Stored image: {filename} ({img_size:.1f}KB)")
+            with self._size_lock:
+                self._current_bytes += written
+                self._pending_index[filename] = (time.time(), len(image_data))
+                cleanup_due = (self._current_bytes > self.cleanup_threshold_gb * (1024**3)
+                               and self._has_expired_files())
+            if cleanup_due:
+                self._schedule_cleanup()
+
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Stored image: {filename} ({len(image_data) / 1024:.1f}KB)")
             return True
         except Exception as e:
             self.logger.error(f"Failed to store image {filename}: {str(e)}", exc_info=True)
+            self._keep_unstored(filename, image_data, metadata)
             return False
 
+    def _keep_unstored(self, filename, image_data, metadata):
+        """Hold an image that could not be written so load_pending can still serve its upload"""
+        with self._pending_lock:
+            self._unstored[filename] = (image_data, metadata)
+            if len(self._unstored) <= self.UNSTORED_MAX_IMAGES:
+                return
+            evicted, _ = self._unstored.popitem(last=False)
+        self.logger.warning(f"Dropped unstored image {evicted}: more than "
+                            f"{self.UNSTORED_MAX_IMAGES} images failed to reach disk")
+
+    def _has_expired_files(self):
+        """Whether the oldest indexed image is past retention (call with _size_lock held)
+
+        A full node normally sits above the threshold with nothing old enough
+        to delete, so non-forced cleanups are only worth queueing once the
+        head of an index has aged out.
+        """
+        cutoff = time.time() - self.retention_days * 24 * 3600
+        return any(index and next(iter(index.values()))[0] < cutoff
+                   for index in (self._uploaded_index, self._pending_index))
+
+    def _schedule_cleanup(self):
+        """Queue cleanup_old_files on the cleanup thread, at most every CLEANUP_MIN_INTERVAL"""
+        now = time.monotonic()
+        with self._size_lock:
+            if self._cleanup_future is not None and not self._cleanup_future.done():
+                return
+            if now - self._cleanup_scheduled_at < self.CLEANUP_MIN_INTERVAL:
+                return
+            self._cleanup_scheduled_at = now
+            self._cleanup_future = self._cleanup_executor.submit(self.cleanup_old_files)
+
+    def store_image_async(self, image_data, filename, metadata=None):
+        """Queue store_image on the writer thread (runs inline when async writes are off)"""
+        if self._writer is None:
+            return self.store_image(image_data, filename, metadata)
+
+        future = self._writer.submit(self.store_image, image_data, filename, metadata)
+        with self._pending_lock:
+            self._pending_writes[filename] = future
+        future.add_done_callback(lambda f, name=filename: self._write_done(name, f))
+        return True
+
+    def _write_done(self, filename, future):
+        with self._pending_lock:
+            if self._pending_writes.get(filename) is future:
+                del self._pending_writes[filename]
+
+    def _wait_for_write(self, filename):
+        """Block until a queued write of filename has reached disk"""
+        with self._pending_lock:
+            future = self._pending_writes.get(filename)
+        if future is not None:
+            future.result()
+
+    def load_pending(self, filename):
+        """Read a stored, not yet uploaded image and its metadata JSON (bytes); None if the image is gone"""
+        # The upload can be picked up before its queued local write lands
+        self._wait_for_write(filename)
+
+        # A failed local write leaves the image in memory instead
+        with self._pending_lock:
+            unstored = self._unstored.get(filename)
+        if unstored is not None:
+            image_data, metadata = unstored
+            metadata_json = dumps_json(metadata or {})
+            if isinstance(metadata_json, str):
+                metadata_json = metadata_json.encode()
+            return image_data, metadata_json
+
+        try:
+            with open(self.base_path / filename, 'rb') as f:
+                image_data = f.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            with open(self.metadata_path / f"{filename}.json", 'rb') as f:
+                metadata_json = f.read()
+        except FileNotFoundError:
+            metadata_json = b'{}'
+        return image_data, metadata_json
+
+    def pending_filenames(self, limit):
+        """Up to limit names of images not yet uploaded, oldest first"""
+        with self._size_lock:
+            filenames = list(islice(self._pending_index, limit))
+        with self._pending_lock:
+            filenames.extend(islice(self._unstored, limit - len(filenames)))
+        return filenames
+
+    def close(self):
+        """Flush queued writes and stop the writer and cleanup threads"""
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+        self._cleanup_executor.shutdown(wait=True)
+
     def mark_as_uploaded(self, filename):
         """Mark file as successfully uploaded"""
         try:
-            # Move image
-            src_path = self.base_path / filename
-            dst_path = self.uploaded_path / filename
-            if src_path.exists():
-                shutil.move(src_path, dst_path)
+            # An upload can finish before its queued local write does
+            self._wait_for_write(filename)
+            with self._pending_lock:
+                self._unstored.pop(filename, None)
+
+            # Same filesystem, so a single rename(2) per file; a missing
+            # source is not an error (try/except instead of an extra stat)
+            try:
+                os.replace(self.base_path / filename, self.uploaded_path / filename)
+                with self._size_lock:
+                    entry = self._pending_index.pop(filename, None)
+                    if entry is not None:
+                        self._insert_by_mtime(self._uploaded_index, filename, entry)
+            except FileNotFoundError:
+                pass
 
             # Move metadata if exists
-            meta_src = self.metadata_path / f"{filename}.json"
-            meta_dst = self.uploaded_path / 'metadata' / f"{filename}.json"
-            if meta_src.exists():
-                meta_dst.parent.mkdir(exist_ok=True)
-                shutil.move(meta_src, meta_dst)
+            try:
+                os.replace(self.metadata_path / f"{filename}.json",
+                           self.uploaded_metadata_path / f"{filename}.json")
+            except FileNotFoundError:
+                pass
 
             self.logger.debug(f"Marked as uploaded: {filename}")
             return True
@@ -1005,24 +1850,71 @@ class StorageManager:
             self.logger.error(f"Failed to mark {filename} as uploaded: {str(e)}", exc_info=True)
             return False
 
+    @staticmethod
+    def _unlink_sized(path):
+        """Delete path and return its size, or 0 if it is already gone"""
+        try:
+            size = path.stat().st_size
+            path.unlink()
+            return size
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def _insert_by_mtime(index, name, entry):
+        """Add entry to index, keeping it ordered by store time (call with _size_lock held)
+
+        Uploads finish out of capture order (requeues, several workers), so an
+        entry moving to the uploaded index may be older than its tail. The
+        newer entries behind it are moved back to the end, which costs the
+        out-of-order distance rather than a re-sort.
+        """
+        index[name] = entry
+        newer = []
+        for key in reversed(index):
+            if key == name:
+                continue
+            if index[key][0] <= entry[0]:
+                break
+            newer.append(key)
+        for key in reversed(newer):
+            index.move_to_end(key)
+
+    def _pop_oldest(self, index, cutoff):
+        """Pop the oldest (name, (mtime, size)) of index if its mtime is before cutoff, else None"""
+        with self._size_lock:
+            if not index:
+                return None
+            name, entry = next(iter(index.items()))
+            if entry[0] >= cutoff:
+                return None
+            del index[name]
+            return name, entry
+
+    def _restore_oldest(self, index, entries):
+        """Put popped entries back at the front of index, in their original order"""
+        with self._size_lock:
+            for name, entry in reversed(entries):
+                index[name] = entry
+                index.move_to_end(name, last=False)
+
     def cleanup_old_files(self, force=False):
         """Remove old files to maintain storage limits
 
+        Files are taken oldest first from the in-memory indexes, so the cost
+        is proportional to the number of deletions rather than files stored.
+
         Args:
             force: If True, delete oldest files regardless of age until under threshold.
                    Used when storage is critically over limit.
         """
-        # Use non-blocking lock to prevent multiple concurrent cleanups
-        if not self._cleanup_lock.acquire(blocking=False):
+        # Skip if another cleanup is in progress; a forced cleanup waits for it instead
+        if not self._cleanup_lock.acquire(blocking=force):
             return  # Another cleanup is in progress
 
+        freed_bytes = 0
         try:
-            def _safe_size(f):
-                try:
-                    return f.stat().st_size
-                except OSError:
-                    return 0
-            current_size_bytes = sum(_safe_size(f) for f in self.base_path.rglob('*') if f.is_file())
+            current_size_bytes = self._current_bytes
             current_size_gb = current_size_bytes / (1024**3)
             target_size_bytes = self.cleanup_threshold_gb * (1024**3)
             retention_seconds = self.retention_days * 24 * 3600
@@ -1032,95 +1924,57 @@ class StorageManager:
                 self.logger.warning(f"Starting storage cleanup. Current: {current_size_gb:.2f}GB, Target: {self.cleanup_threshold_gb}GB" +
                                     (" (forced)" if force else ""))
 
-                # Remove old uploaded files first
-                if self.uploaded_path.exists():
-                    # Get files with their mtime and size, handling files that may have been deleted
-                    uploaded_files = []
-                    for f in self.uploaded_path.glob('*.jpg'):
-                        try:
-                            stat = f.stat()
-                            uploaded_files.append((f, stat.st_mtime, stat.st_size))
-                        except OSError:
-                            continue  # File deleted or inode corrupted — skip
-                    uploaded_files.sort(key=lambda x: x[1])  # Sort by mtime (oldest first)
-
-                    for file, mtime, file_size in uploaded_files:
-                        file_age = datetime.now().timestamp() - mtime
-                        # Delete if: older than retention OR force mode is on
-                        if file_age > retention_seconds or force:
-                            try:
-                                # Remove image and its metadata
-                                file.unlink()
-                                current_size_bytes -= file_size
-                                deleted_count += 1
-                                meta_file = self.uploaded_path / 'metadata' / f"{file.name}.json"
-                                if meta_file.exists():
-                                    meta_file.unlink()
-                            except FileNotFoundError:
-                                # File already deleted, skip silently
-                                continue
-                            except Exception as e:
-                                # Log other errors but continue cleanup
-                                self.logger.warning(f"Failed to delete {file.name}: {str(e)}")
-                                continue
-
-                            if current_size_bytes < target_size_bytes:
-                                break
-
-                # If still above threshold, remove old non-uploaded files
-                if current_size_bytes > target_size_bytes:
-                    non_uploaded_files = []
-                    for f in self.base_path.glob('*.jpg'):
+                # Delete if: older than retention OR force mode is on
+                cutoff = float('inf') if force else time.time() - retention_seconds
+
+                # Remove old uploaded files first, then non-uploaded ones
+                for index, image_dir, metadata_dir in (
+                        (self._uploaded_index, self.uploaded_path, self.uploaded_metadata_path),
+                        (self._pending_index, self.base_path, self.metadata_path)):
+                    undeleted = []  # Entries whose image could not be removed
+                    while current_size_bytes >= target_size_bytes:
+                        popped = self._pop_oldest(index, cutoff)
+                        if popped is None:
+                            break
+                        name, entry = popped
+                        file_size = entry[1]
                         try:
-                            stat = f.stat()
-                            non_uploaded_files.append((f, stat.st_mtime, stat.st_size))
-                        except OSError:
+                            # Remove image and its metadata
+                            os.unlink(image_dir / name)
+                            deleted_count += 1
+                        except FileNotFoundError:
+                            # Deleted outside the service; its bytes are still
+                            # in the counter, so drop them below to undo the drift
+                            pass
+                        except Exception as e:
+                            # Log other errors but continue cleanup; the file is
+                            # still on disk, so keep it indexed (and counted)
+                            self.logger.warning(f"Failed to delete {name}: {str(e)}")
+                            undeleted.append(popped)
                             continue
-                    non_uploaded_files.sort(key=lambda x: x[1])
-
-                    for file, mtime, file_size in non_uploaded_files:
-                        file_age = datetime.now().timestamp() - mtime
-                        # Delete if: older than retention OR force mode is on
-                        if file_age > retention_seconds or force:
-                            try:
-                                file.unlink()
-                                current_size_bytes -= file_size
-                                deleted_count += 1
-                                meta_file = self.metadata_path / f"{file.name}.json"
-                                if meta_file.exists():
-                                    meta_file.unlink()
-                            except FileNotFoundError:
-                                continue
-                            except Exception as e:
-                                self.logger.warning(f"Failed to delete {file.name}: {str(e)}")
-                                continue
-
-                            if current_size_bytes < target_size_bytes:
-                                break
+                        current_size_bytes -= file_size
+                        freed_bytes += file_size
+                        try:
+                            freed_bytes += self._unlink_sized(metadata_dir / f"{name}.json")
+                        except Exception as e:
+                            self.logger.warning(f"Failed to delete metadata for {name}: {str(e)}")
+                    if undeleted:
+                        self._restore_oldest(index, undeleted)
 
                 final_size_gb = current_size_bytes / (1024**3)
-                self.logger.warning(f"Cleanup completed. Deleted {deleted_count} files. New size: {final_size_gb:.2f}GB")
+                # Nothing past retention is routine on a full node, not a warning
+                log = self.logger.warning if deleted_count else self.logger.info
+                log(f"Cleanup completed. Deleted {deleted_count} files. New size: {final_size_gb:.2f}GB")
 
         except Exception as e:
             self.logger.error(f"Cleanup error: {str(e)}", exc_info=True)
         finally:
+            with self._size_lock:
+                self._current_bytes = max(0, self._current_bytes - freed_bytes)
             self._cleanup_lock.release()
 
-    def run_cleanup_thread(self):
-        """Run periodic cleanup"""
-        while self.running:
-            try:
-                # Use force mode if storage is critically over limit
-                current_size = self.get_current_size_gb()
-                force = current_size >= self.max_size_gb
-                self.cleanup_old_files(force=force)
-                time.sleep(3600)  # Check every hour
-            except Exception as e:
-                self.logger.error(f"Cleanup thread error: {str(e)}", exc_info=True)
-                time.sleep(60)  # Wait a minute before retrying
-
 class HealthMonitor:
-    def __init__(self, config, logger, restart_callback):
+    def __init__(self, config, logger, restart_callback, metrics_sampler=None):
         """Initialize the health monitor"""
         self.config = config
         self.logger = logger
@@ -1136,6 +1990,10 @@ class HealthMonitor:
             'error_count': 0
         }
 
+        # CPU/memory/disk readings; the sampler primes psutil's non-blocking CPU counter
+        self.metrics_sampler = metrics_sampler or SystemMetricsSampler()
+        self._has_temperatures = hasattr(psutil, "sensors_temperatures")
+
     def check_system_health(self):
         """Check system resources and health"""
         try:
@@ -1143,26 +2001,28 @@ class HealthMonitor:
             self.metrics['check_count'] += 1
             self.metrics['last_check'] = time.time()
 
+            system = self.metrics_sampler.snapshot()
+
             # Check CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = system['cpu_percent']
             if cpu_percent > self.config['max_cpu_percent']:
                 self.metrics['warning_count'] += 1
                 self.logger.warning(f"High CPU usage: {cpu_percent}%")
 
             # Check memory usage
-            memory = psutil.virtual_memory()
-            if memory.percent > self.config['max_memory_percent']:
+            memory_percent = system['memory_percent']
+            if memory_percent > self.config['max_memory_percent']:
                 self.metrics['warning_count'] += 1
-                self.logger.warning(f"High memory usage: {memory.percent}%")
+                self.logger.warning(f"High memory usage: {memory_percent}%")
 
             # Check disk usage
-            disk = psutil.disk_usage('/')
-            if disk.percent > 90:  # Hard-coded threshold for disk space
+            disk_percent = system['disk_percent']
+            if disk_percent > 90:  # Hard-coded threshold for disk space
                 self.metrics['warning_count'] += 1
-                self.logger.warning(f"High disk usage: {disk.percent}%")
+                self.logger.warning(f"High disk usage: {disk_percent}%")
 
             # Check system temperature if available
-            if hasattr(psutil, "sensors_temperatures"):
+            if self._has_temperatures:
                 temps = psutil.sensors_temperatures()
                 if temps:
                     for name, entries in temps.items():
@@ -1174,7 +2034,7 @@ class HealthMonitor:
             # Trigger restart if configured and thresholds exceeded
             if (self.config.get('restart_on_failure', False) and
                 (cpu_percent > self.config['max_cpu_percent'] or
-                 memory.percent > self.config['max_memory_percent'])):
+                 memory_percent > self.config['max_memory_percent'])):
                 self.logger.error("Critical resource usage detected, initiating restart")
                 self.metrics['error_count'] += 1
                 self.restart_callback()
@@ -98,6 +98,18 @@ def validate_camera_config(camera_config: Dict[str, Any]) -> Dict[str, str]:
         elif not all(isinstance(x, int) and x > 0 for x in resolution):
             errors['resolution'] = "Resolution values must be positive integers"
     
+    if 'target_resolution' in camera_config:
+        target = camera_config['target_resolution']
+        if not isinstance(target, list) or len(target) != 2:
+            errors['target_resolution'] = "Target resolution must be [width, height]"
+        elif not all(isinstance(x, int) and x > 0 for x in target):
+            errors['target_resolution'] = "Target resolution values must be positive integers"
+    
+    if 'motion_threshold' in camera_config:
+        threshold = camera_config['motion_threshold']
+        if not isinstance(threshold, (int, float)) or threshold < 0:
+            errors['motion_threshold'] = "Motion threshold must be a non-negative number"
+    
     if 'fps' in camera_config:
         fps = camera_config['fps']
         if not isinstance(fps, (int, float)) or fps <= 0:
@@ -5,8 +5,11 @@ Implements camera interface for ONVIF-compatible IP cameras.
 Based on the proven onvif-test.py implementation.
 """
 
+import glob
+import os
+import sys
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import numpy as np
 import requests
 from requests.auth import HTTPDigestAuth
@@ -24,6 +27,50 @@ except ImportError:
     from logging_utils import redact_url_credentials
 
 
+# Candidate WSDL directories, checked in order
+WSDL_CANDIDATE_PATHS = [
+    f'/opt/sai-cam/venv/lib/python{sys.version_info.major}.{sys.version_info.minor}/site-packages/wsdl/',
+    '/opt/sai-cam/venv/lib/python3.4/site-packages/wsdl/',  # Legacy path from working script
+    f'/opt/sai-cam/venv/lib/python{sys.version_info.major}.{sys.version_info.minor}/site-packages/onvif/wsdl/',
+    # Additional common paths
+    '/usr/local/lib/python3*/site-packages/wsdl/',
+    './venv/lib/python3*/site-packages/wsdl/',
+]
+
+# First WSDL directory found; setup() runs on every reconnect, so probe the filesystem once
+_detected_wsdl_path: Optional[str] = None
+
+
+def detect_wsdl_path() -> Tuple[Optional[str], List[str]]:
+    """
+    Find the onvif-zeep WSDL directory.
+
+    Returns:
+        tuple: (wsdl_path or None, list of checked paths for error reporting)
+    """
+    global _detected_wsdl_path
+    if _detected_wsdl_path:
+        return _detected_wsdl_path, []
+
+    checked_paths = []
+    for path in WSDL_CANDIDATE_PATHS:
+        if '*' not in path:
+            if os.path.exists(path):
+                _detected_wsdl_path = path
+                return path, checked_paths
+            checked_paths.append(path)
+            continue
+
+        # Glob results already exist on disk; no extra stat needed
+        matches = glob.glob(path)
+        if matches:
+            _detected_wsdl_path = matches[0]
+            return matches[0], checked_paths
+        checked_paths.append(f"{path} (no matches)")
+
+    return None, checked_paths
+
+
 class ONVIFCameraImpl(BaseCamera):
     """ONVIF camera implementation using snapshot capture"""
     
@@ -84,11 +131,6 @@ class ONVIFCameraImpl(BaseCamera):
             self.logger.info(f"Camera {self.camera_id}: Initializing ONVIF camera at {self.address}:{self.port}")
             
             # Initialize ONVIF camera connection with WSDL path
-            # Detect correct WSDL path based on Python version and environment
-            import sys
-            import os
-            from pathlib import Path
-            
             # Allow WSDL path to be configured via environment variable or config
             wsdl_path = self.config_helper.get_secure_value(
                 'ONVIF_WSDL_PATH',
@@ -96,39 +138,12 @@ class ONVIFCameraImpl(BaseCamera):
                 description=f"ONVIF WSDL path for camera {self.camera_id}"
             )
             
+            checked_paths = []
             if not wsdl_path:
-                # Auto-detect WSDL path
-                import glob
-                potential_paths = [
-                    f'/opt/sai-cam/venv/lib/python{sys.version_info.major}.{sys.version_info.minor}/site-packages/wsdl/',
-                    '/opt/sai-cam/venv/lib/python3.4/site-packages/wsdl/',  # Legacy path from working script
-                    f'/opt/sai-cam/venv/lib/python{sys.version_info.major}.{sys.version_info.minor}/site-packages/onvif/wsdl/',
-                    # Additional common paths
-                    '/usr/local/lib/python3*/site-packages/wsdl/',
-                    './venv/lib/python3*/site-packages/wsdl/',
-                ]
-
-                # Track checked paths for error reporting
-                checked_paths = []
-
-                # Find the first existing WSDL path
-                for path in potential_paths:
-                    # Handle glob patterns
-                    if '*' in path:
-                        matches = glob.glob(path)
-                        if matches:
-                            resolved_path = matches[0]
-                            if os.path.exists(resolved_path):
-                                wsdl_path = resolved_path
-                                self.logger.debug(f"Camera {self.camera_id}: Auto-detected WSDL path: {wsdl_path}")
-                                break
-                        checked_paths.append(f"{path} (no matches)")
-                    elif os.path.exists(path):
-                        wsdl_path = path
-                        self.logger.debug(f"Camera {self.camera_id}: Auto-detected WSDL path: {wsdl_path}")
-                        break
-                    else:
-                        checked_paths.append(path)
+                # Auto-detect WSDL path (cached after the first hit)
+                wsdl_path, checked_paths = detect_wsdl_path()
+                if wsdl_path:
+                    self.logger.debug(f"Camera {self.camera_id}: Auto-detected WSDL path: {wsdl_path}")
 
             if wsdl_path:
                 self.onvif_camera = ONVIFCamera(
@@ -9,7 +9,7 @@ import time
 from typing import Optional, Dict, Any
 import numpy as np
 import cv2
-from threading import Lock
+from threading import Event, Lock, Thread
 
 from .base_camera import BaseCamera
 try:
@@ -39,6 +39,16 @@ class RTSPCamera(BaseCamera):
         # Advanced RTSP settings
         self.buffer_size = camera_config.get('buffer_size', 0)
         self.init_wait = global_config.get('advanced', {}).get('camera_init_wait', 2)
+
+        # Optional GStreamer pipeline ending in a BGR appsink (hardware decode on
+        # V4L2/VAAPI targets); falls back to FFmpeg if OpenCV cannot open it
+        self.gstreamer_pipeline = camera_config.get('gstreamer_pipeline')
+
+        # Optional background grab thread keeps the FFmpeg buffer drained
+        self.grab_thread = camera_config.get('grab_thread', False)
+        self._grab_thread = None
+        self._grab_stop = Event()
+        self._fresh_grab = False
     
     def setup(self) -> bool:
         """Initialize RTSP camera connection"""
@@ -46,8 +56,7 @@ class RTSPCamera(BaseCamera):
             self.logger.info(f"Camera {self.camera_id}: Initializing RTSP with URL: {redact_url_credentials(self.rtsp_url)}")
             
             with self.lock:
-                # Initialize the capture with FFMPEG backend
-                self.cap = cv2.VideoCapture(self.rtsp_url, cv2.CAP_FFMPEG)
+                self.cap = self._open_capture()
                 
                 if not self.cap.isOpened():
                     self.logger.error(f"Camera {self.camera_id}: Failed to open RTSP stream")
@@ -93,6 +102,8 @@ class RTSPCamera(BaseCamera):
 
                 self.is_connected = True
                 self.reset_reconnect_attempts()
+                if self.grab_thread:
+                    self._start_grab_thread()
                 return True
                 
         except Exception as e:
@@ -100,6 +111,22 @@ class RTSPCamera(BaseCamera):
             self.is_connected = False
             return False
     
+    def _open_capture(self):
+        """Create the VideoCapture, trying the GStreamer pipeline before FFmpeg"""
+        if self.gstreamer_pipeline:
+            cap = cv2.VideoCapture(self.gstreamer_pipeline, cv2.CAP_GSTREAMER)
+            if cap.isOpened():
+                self.logger.info(f"Camera {self.camera_id}: Using GStreamer pipeline")
+                return cap
+            cap.release()
+            self.logger.warning(
+                f"Camera {self.camera_id}: GStreamer pipeline failed to open "
+                f"(OpenCV built without GStreamer?), falling back to FFmpeg"
+            )
+
+        # Initialize the capture with FFMPEG backend
+        return cv2.VideoCapture(self.rtsp_url, cv2.CAP_FFMPEG)
+
     def capture_frame(self) -> Optional[np.ndarray]:
         """Capture frame from RTSP stream.
 
@@ -117,7 +144,7 @@ class RTSPCamera(BaseCamera):
                     self.is_connected = False
                     return None
 
-                ret, frame = self.cap.read()
+                ret, frame = self._read_latest()
 
                 if ret and frame is not None:
                     return frame
@@ -131,7 +158,7 @@ class RTSPCamera(BaseCamera):
                 return None
 
             with self.lock:
-                ret, frame = self.cap.read()
+                ret, frame = self._grab_and_retrieve()
                 if not ret or frame is None:
                     self.logger.warning(f"Camera {self.camera_id}: Frame read failed after reconnect")
                     return None
@@ -141,10 +168,64 @@ class RTSPCamera(BaseCamera):
             self.logger.warning(f"Camera {self.camera_id}: RTSP capture error: {str(e)}")
             return None
     
+    def _grab_and_retrieve(self):
+        """Advance the stream with grab() and convert only that frame with retrieve().
+
+        Caller must hold self.lock. Keeping the two steps separate lets the
+        keep-alive path (grab_frame) skip the BGR conversion for frames that
+        are never used.
+        """
+        if not self.cap.grab():
+            return False, None
+        return self.cap.retrieve()
+
+    def _read_latest(self):
+        """Decode the newest frame, reusing the grab thread's last grab if there is one.
+
+        Caller must hold self.lock.
+        """
+        if self._fresh_grab:
+            self._fresh_grab = False
+            return self.cap.retrieve()
+        return self._grab_and_retrieve()
+
+    def _start_grab_thread(self) -> None:
+        """Start the background grab loop (called from setup with the lock held)"""
+        self._grab_stop.clear()
+        self._fresh_grab = False
+        self._grab_thread = Thread(target=self._grab_loop, name=f"Grab-{self.camera_id}", daemon=True)
+        self._grab_thread.start()
+
+    def _stop_grab_thread(self) -> None:
+        """Stop the background grab loop; must be called without holding the lock"""
+        self._grab_stop.set()
+        if self._grab_thread is not None:
+            self._grab_thread.join(timeout=2)
+            self._grab_thread = None
+        self._fresh_grab = False
+
+    def _grab_loop(self) -> None:
+        """Grab (without decoding) at the stream rate so retrieve() returns a current frame"""
+        interval = 1.0 / max(self.fps, 1)
+        while not self._grab_stop.is_set():
+            with self.lock:
+                if self.cap is None or not self.cap.isOpened():
+                    self._fresh_grab = False
+                    break
+                try:
+                    self._fresh_grab = bool(self.cap.grab())
+                except Exception:
+                    self._fresh_grab = False
+            self._grab_stop.wait(interval)
+
     def grab_frame(self) -> bool:
         """Grab frame without retrieving (useful for keeping stream alive)"""
         if not self.is_connected:
             return False
+
+        # The grab thread already keeps the stream drained
+        if self._grab_thread is not None and self._grab_thread.is_alive():
+            return True
         
         try:
             with self.lock:
@@ -175,7 +256,8 @@ class RTSPCamera(BaseCamera):
     def cleanup(self) -> None:
         """Clean up RTSP camera resources"""
         self.logger.debug(f"Camera {self.camera_id}: Cleaning up RTSP resources")
-        
+
+        self._stop_grab_thread()
         with self.lock:
             if self.cap is not None:
                 self.cap.release()
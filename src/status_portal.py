@@ -881,6 +881,8 @@ def query_health_socket():
         client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
         client.settimeout(2.0)
         client.connect(socket_path)
+        # No command to send; EOF lets the service answer without waiting for one
+        client.shutdown(socket.SHUT_WR)
 
         data = b''
         while True:
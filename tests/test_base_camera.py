@@ -75,6 +75,15 @@ class TestValidateFrame:
         warnings = [r for r in mock_logger._test_handler.records if r.levelno == logging.WARNING]
         assert any("High brightness" in r.getMessage() for r in warnings)
 
+    def test_sampled_mean_sees_whole_frame(self, mock_logger):
+        cam = _make_camera(logger=mock_logger)
+        # Dark except for a bright lower half; the strided sample must not miss it
+        frame = np.full((1080, 1920, 3), 2, dtype=np.uint8)
+        frame[540:] = 255
+        cam.validate_frame(frame)
+        warnings = [r for r in mock_logger._test_handler.records if r.levelno == logging.WARNING]
+        assert len(warnings) == 0
+
     def test_midrange_frame_no_warning(self, mock_logger):
         cam = _make_camera(logger=mock_logger)
         frame = np.full((480, 640, 3), 128, dtype=np.uint8)
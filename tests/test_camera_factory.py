@@ -86,6 +86,18 @@ class TestValidateCameraConfig:
         errors = validate_camera_config({'id': 'c', 'type': 'rtsp', 'rtsp_url': 'rtsp://h/s', 'resolution': "1920x1080"})
         assert 'resolution' in errors
 
+    def test_valid_target_resolution(self):
+        errors = validate_camera_config({'id': 'c', 'type': 'rtsp', 'rtsp_url': 'rtsp://h/s', 'target_resolution': [960, 540]})
+        assert 'target_resolution' not in errors
+
+    def test_invalid_target_resolution(self):
+        errors = validate_camera_config({'id': 'c', 'type': 'rtsp', 'rtsp_url': 'rtsp://h/s', 'target_resolution': [960]})
+        assert 'target_resolution' in errors
+
+    def test_invalid_motion_threshold(self):
+        errors = validate_camera_config({'id': 'c', 'type': 'rtsp', 'rtsp_url': 'rtsp://h/s', 'motion_threshold': -1})
+        assert 'motion_threshold' in errors
+
     # --- FPS validation ---
 
     def test_invalid_fps_zero(self):
@@ -1,12 +1,18 @@
 """Tests for CameraInstance and CameraService from src/camera_service.py."""
 
+import hashlib
+import json
+import os
+import socket
 import time
-from threading import Event
+from queue import Empty
+from threading import Event, Lock, Thread
 from unittest.mock import patch, MagicMock
 
+import numpy as np
 import pytest
 
-from camera_service import CameraService, CameraInstance
+from camera_service import CameraService, CameraInstance, SystemMetricsSampler, UploadQueue
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -58,11 +64,22 @@ def _make_service(mock_logger):
     svc.camera_instances = {}
     svc.camera_threads = {}
     svc.failed_cameras = {}
+    svc._retry_heap = []
+    svc._retry_lock = Lock()
+    svc._retry_wakeup = Event()
+    svc._command_lock = Lock()
+    svc._health_cache = (0.0, None)
+    svc._health_cache_lock = Lock()
     svc.running = True
     svc.upload_queue = MagicMock()
+    svc.session = MagicMock()
+    svc._http2 = False
+    svc.process_pool = MagicMock()
+    svc.metrics_sampler = SystemMetricsSampler()
     svc.storage_manager = MagicMock()
     svc.health_monitor = MagicMock()
     svc.health_monitor.metrics = {'check_count': 0, 'warning_count': 0, 'error_count': 0, 'last_check': 0}
+    svc._refresh_upload_settings()
     return svc
 
 
@@ -90,6 +107,21 @@ class TestCameraInstanceInit:
         inst.stop()
         assert inst.running is False
 
+    def test_static_metadata_built_once(self, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        assert inst._metadata_identity == {
+            'device_id': 'node-01',
+            'camera_id': 'cam-test-01',
+            'location': 'Lab',
+            'version': inst._metadata_identity['version'],
+            'camera_type': 'rtsp',
+        }
+        assert inst._metadata_camera == {
+            'capture_interval': 120,
+            'position': {},
+            'resolution': [1280, 720],
+        }
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # _handle_command
@@ -159,6 +191,32 @@ class TestRecordCameraFailure:
         # After 20 failures, multiplier capped at 12
         assert attempts == 20
 
+    def test_failure_schedules_retry_and_wakes_thread(self, mock_logger):
+        svc = _make_service(mock_logger)
+        svc._record_camera_failure('cam1', {'capture_interval': 60})
+        _, _, next_retry = svc.failed_cameras['cam1']
+        assert svc._retry_heap == [(next_retry, 'cam1')]
+        assert svc._retry_wakeup.is_set()
+
+    def test_pop_due_retries_skips_stale_entries(self, mock_logger):
+        svc = _make_service(mock_logger)
+        cam_config = {'capture_interval': 60}
+        svc._record_camera_failure('cam1', cam_config)
+        svc._record_camera_failure('cam1', cam_config)  # supersedes first deadline
+        svc._record_camera_failure('cam2', cam_config)
+        del svc.failed_cameras['cam2']  # recovered meanwhile
+
+        due = svc._pop_due_retries(time.time() + 10_000)
+
+        assert due == [('cam1', cam_config)]
+        assert svc._retry_heap == []
+
+    def test_pop_due_retries_leaves_future_entries(self, mock_logger):
+        svc = _make_service(mock_logger)
+        svc._record_camera_failure('cam1', {'capture_interval': 60})
+        assert svc._pop_due_retries(time.time()) == []
+        assert len(svc._retry_heap) == 1
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # _get_health_data
@@ -207,6 +265,127 @@ class TestGetHealthData:
         assert 'cam1' in data['cameras']
         assert data['cameras']['cam1']['state'] == 'healthy'
 
+    @patch("camera_service.psutil")
+    def test_reports_upload_backlog(self, mock_psutil, mock_logger):
+        mock_psutil.cpu_percent.return_value = 10
+        mock_psutil.virtual_memory.return_value = MagicMock(percent=30)
+        mock_psutil.disk_usage.return_value = MagicMock(percent=40)
+
+        svc = _make_service(mock_logger)
+        svc.upload_queue = UploadQueue(maxsize=2)
+        for i in range(3):
+            svc.upload_queue.put(i)
+
+        data = svc._get_health_data()
+        assert data['upload_queue'] == {'pending': 2, 'dropped': 1}
+
+    @patch("camera_service.psutil")
+    def test_thread_liveness_checked_once_per_thread(self, mock_psutil, mock_logger):
+        svc = _make_service(mock_logger)
+        instance = MagicMock()
+        instance.state_tracker.get_status.side_effect = lambda: {'state': 'healthy'}
+        svc.camera_instances = {'cam1': instance, 'cam2': instance}
+        alive = MagicMock(is_alive=MagicMock(return_value=True))
+        dead = MagicMock(is_alive=MagicMock(return_value=False))
+        svc.camera_threads = {'cam1': alive, 'cam2': dead}
+
+        data = svc._get_health_data()
+
+        assert data['threads'] == {'total': 2, 'alive': 1, 'cameras': {'cam1': True, 'cam2': False}}
+        assert data['cameras']['cam1']['thread_alive'] is True
+        assert data['cameras']['cam2']['thread_alive'] is False
+        alive.is_alive.assert_called_once_with()
+        dead.is_alive.assert_called_once_with()
+
+    @patch("camera_service.psutil")
+    def test_system_metrics_come_from_shared_sampler(self, mock_psutil, mock_logger):
+        svc = _make_service(mock_logger)
+        svc.metrics_sampler = MagicMock()
+        svc.metrics_sampler.snapshot.return_value = {'cpu_percent': 12.0, 'memory_percent': 34.5,
+                                                     'disk_percent': 56.7, 'cpu_temp': 48.0}
+
+        data = svc._get_health_data()
+
+        assert data['system'] == {'cpu_percent': 12.0, 'memory_percent': 34.5, 'disk_percent': 56.7}
+        mock_psutil.virtual_memory.assert_not_called()
+        mock_psutil.disk_usage.assert_not_called()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# _serve_health_connection
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestServeHealthConnection:
+
+    def _exchange(self, svc, request=None):
+        server, client = socket.socketpair()
+        with client:
+            if request is not None:
+                client.sendall(request)
+            client.shutdown(socket.SHUT_WR)
+            svc._serve_health_connection(server)
+            return json.loads(client.recv(65536))
+
+    def test_eof_returns_health_data_without_waiting(self, mock_logger):
+        svc = _make_service(mock_logger)
+        svc._get_health_data = MagicMock(return_value={'status': 'ok'})
+        start = time.monotonic()
+        assert self._exchange(svc) == {'status': 'ok'}
+        assert time.monotonic() - start < 0.4  # no 0.5s read timeout
+
+    def test_runs_command(self, mock_logger):
+        svc = _make_service(mock_logger)
+        svc._handle_command = MagicMock(return_value={'ok': True})
+        assert self._exchange(svc, b'{"action": "force_capture"}') == {'ok': True}
+        svc._handle_command.assert_called_once_with({'action': 'force_capture'})
+
+    def test_bad_command_returns_error(self, mock_logger):
+        svc = _make_service(mock_logger)
+        assert 'error' in self._exchange(svc, b'not json')
+
+    def test_peer_allowed_by_uid(self, mock_logger):
+        svc = _make_service(mock_logger)
+        server, client = socket.socketpair()
+        with server, client:
+            assert svc._health_peer_allowed(server, {os.getuid()})
+            assert not svc._health_peer_allowed(server, {os.getuid() + 1})
+
+    def test_peer_rejected_when_credentials_unreadable(self, mock_logger):
+        svc = _make_service(mock_logger)
+        conn = MagicMock()
+        conn.getsockopt.side_effect = OSError("not a unix socket")
+        assert not svc._health_peer_allowed(conn, {0})
+
+    def test_health_payload_cached_within_ttl(self, mock_logger):
+        svc = _make_service(mock_logger)
+        svc._get_health_data = MagicMock(return_value={'status': 'ok'})
+        first = svc._get_health_bytes()
+        assert svc._get_health_bytes() is first
+        svc._get_health_data.assert_called_once()
+
+    @patch("camera_service.orjson", None)
+    def test_health_payload_without_orjson(self, mock_logger):
+        svc = _make_service(mock_logger)
+        svc._get_health_data = MagicMock(return_value={'status': 'ok'})
+        payload = svc._get_health_bytes()
+        assert isinstance(payload, bytes)
+        assert json.loads(payload) == {'status': 'ok'}
+
+    def test_health_payload_rebuilt_after_ttl(self, mock_logger):
+        svc = _make_service(mock_logger)
+        svc._get_health_data = MagicMock(side_effect=[{'n': 1}, {'n': 2}])
+        with patch("camera_service.time.monotonic", side_effect=[100.0, 101.0]):
+            assert json.loads(svc._get_health_bytes()) == {'n': 1}
+            assert json.loads(svc._get_health_bytes()) == {'n': 2}
+
+    def test_command_invalidates_health_payload(self, mock_logger):
+        svc = _make_service(mock_logger)
+        svc._get_health_data = MagicMock(side_effect=[{'n': 1}, {'n': 2}])
+        svc._handle_command = MagicMock(return_value={'ok': True})
+        svc._get_health_bytes()
+        self._exchange(svc, b'{"action": "restart_camera", "camera_id": "cam1"}')
+        assert json.loads(svc._get_health_bytes()) == {'n': 2}
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # _restart_camera
@@ -257,6 +436,7 @@ class TestRestartCamera:
         _, attempts, next_retry = svc.failed_cameras['cam1']
         assert attempts == 0
         assert next_retry == 0
+        assert svc._pop_due_retries(time.time()) == [('cam1', cam_config)]
 
     def test_restart_unknown_camera_returns_error(self, mock_logger):
         """Restarting an unknown camera returns an error."""
@@ -300,7 +480,39 @@ class TestCameraServiceCleanup:
         assert svc.running is False
         cam1.stop.assert_called_once()
         cam2.stop.assert_called_once()
-        mock_exit.assert_called_once_with(0)
+        svc.session.close.assert_called_once()
+        mock_exit.assert_not_called()  # callers decide whether to exit
+
+    def test_shutdown_signal_cleans_up_and_exits(self, mock_logger):
+        svc = _make_service(mock_logger)
+        with pytest.raises(SystemExit) as exc:
+            svc.handle_shutdown(15, None)
+        assert exc.value.code == 0
+        assert svc.running is False
+        svc.storage_manager.close.assert_called_once()
+
+    @patch.dict("camera_service.os.environ", {'INVOCATION_ID': 'abc'})
+    @patch("camera_service.logging.shutdown")
+    @patch("camera_service.daemon")
+    @patch("camera_service.os.execv")
+    @patch("camera_service.os._exit")
+    def test_restart_under_systemd_exits_nonzero(self, mock_exit, mock_execv, mock_daemon,
+                                                 _shutdown, mock_logger):
+        svc = _make_service(mock_logger)
+        svc.restart_service()
+        assert svc.running is False
+        mock_daemon.notify.assert_called_once_with('STOPPING=1')
+        mock_exit.assert_called_once_with(1)
+        mock_execv.assert_not_called()
+
+    @patch.dict("camera_service.os.environ", clear=True)
+    @patch("camera_service.os.execv")
+    @patch("camera_service.os._exit")
+    def test_restart_without_systemd_reexecs(self, mock_exit, mock_execv, mock_logger):
+        svc = _make_service(mock_logger)
+        svc.restart_service()
+        mock_execv.assert_called_once()
+        mock_exit.assert_not_called()
 
     @patch("camera_service.sys.exit")
     def test_cleanup_when_no_cameras(self, mock_exit, mock_logger):
@@ -311,7 +523,7 @@ class TestCameraServiceCleanup:
         svc.cleanup()
 
         assert svc.running is False
-        mock_exit.assert_called_once_with(0)
+        mock_exit.assert_not_called()
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -406,29 +618,141 @@ class TestDisableUpload:
 
 
 # ──────────────────────────────────────────────────────────────────────────────
-# compress_image
+# handle_reload
 # ──────────────────────────────────────────────────────────────────────────────
 
-@pytest.mark.smoke
-class TestCompressImage:
+class TestHandleReload:
+
+    def test_refreshes_upload_settings(self, mock_logger, tmp_path):
+        import yaml
+        svc = _make_service(mock_logger)
+        svc._configured_log_level = 'WARNING'
+        new_config = {k: v for k, v in svc.config.items() if k != '_start_time'}
+        new_config['server'] = {**svc.config['server'], 'url': 'https://new.test/upload', 'auth_token': 'new'}
+        svc.config_path = str(tmp_path / 'config.yaml')
+        (tmp_path / 'config.yaml').write_text(yaml.safe_dump(new_config))
+
+        svc.handle_reload(None, None)
+
+        assert svc._upload_settings['url'] == 'https://new.test/upload'
+        assert svc._upload_settings['headers'] == {'Authorization': 'Bearer new'}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# upload_images
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestUploadImages:
+
+    def test_blocks_on_queue_and_uploads(self, mock_logger):
+        svc = _make_service(mock_logger)
+        svc.upload_enabled = True
+        svc.upload_queue = MagicMock()
+        svc.upload_queue.get.side_effect = [Empty, ('cam1.jpg', 'cam1')]
+        svc.storage_manager.load_pending.return_value = (b'jpeg', b'{}')
+        svc.session.post.return_value.status_code = 200
+        svc.session.post.return_value.elapsed.total_seconds.return_value = 0.2
+
+        def stop(_filename):
+            svc.running = False
+        svc.storage_manager.mark_as_uploaded.side_effect = stop
+
+        with patch("camera_service.time.sleep") as mock_sleep:
+            svc.upload_images()
+
+        svc.upload_queue.get.assert_called_with(timeout=1.0)
+        svc.upload_queue.empty.assert_not_called()
+        svc.storage_manager.mark_as_uploaded.assert_called_once_with('cam1.jpg')
+        mock_sleep.assert_not_called()
+
+    def _run_once(self, svc, status_code):
+        svc.upload_enabled = True
+        svc.upload_queue = UploadQueue(maxsize=10)
+        svc.upload_queue.put(('cam1.jpg', 'cam1'))
+        svc.storage_manager.load_pending.return_value = (b'jpeg', b'{}')
+        response = MagicMock(status_code=status_code, content=b'nope')
+
+        def post_once(*_args, **_kwargs):
+            svc.running = False
+            return response
+        svc.session.post.side_effect = post_once
+
+        with patch("camera_service.time.sleep") as mock_sleep:
+            svc.upload_images()
+        return mock_sleep
+
+    def test_server_error_requeues_with_backoff(self, mock_logger):
+        svc = _make_service(mock_logger)
+        mock_sleep = self._run_once(svc, 503)
+        assert svc.upload_queue.qsize() == 1
+        mock_sleep.assert_called_once_with(1)
+        svc.storage_manager.mark_as_uploaded.assert_not_called()
+
+    def test_client_error_is_not_requeued(self, mock_logger):
+        svc = _make_service(mock_logger)
+        mock_sleep = self._run_once(svc, 400)
+        assert svc.upload_queue.qsize() == 0
+        mock_sleep.assert_not_called()
 
-    def test_compress_image_returns_same_data(self, mock_logger):
-        """compress_image() returns input data unchanged (current impl)."""
+    def test_batches_already_queued_items(self, mock_logger):
         svc = _make_service(mock_logger)
-        data = b'\x00\x01\x02\x03\x04\x05'
+        svc.upload_enabled = True
+        svc.config['server']['upload_batch_max'] = 3
+        svc._refresh_upload_settings()
+        svc.upload_queue = UploadQueue(maxsize=10)
+        for i in range(4):
+            svc.upload_queue.put((f'img{i}.jpg', 'cam1'))
+        svc.storage_manager.load_pending.return_value = (b'jpeg', b'{}')
+        svc.session.post.return_value.status_code = 200
+        svc.session.post.return_value.elapsed.total_seconds.return_value = 0.2
+
+        def stop(_filename):
+            svc.running = False
+        svc.storage_manager.mark_as_uploaded.side_effect = stop
+
+        svc.upload_images()
+
+        svc.session.post.assert_called_once()
+        marked = [c.args[0] for c in svc.storage_manager.mark_as_uploaded.call_args_list]
+        assert marked == ['img0.jpg', 'img1.jpg', 'img2.jpg']
+        assert svc.upload_queue.qsize() == 1
+
+    def test_skips_images_no_longer_stored(self, mock_logger):
+        svc = _make_service(mock_logger)
+        svc.upload_enabled = True
+        svc.upload_queue = UploadQueue(maxsize=10)
+        svc.upload_queue.put(('gone.jpg', 'cam1'))
 
-        result = svc.compress_image(data)
+        def load_once(_filename):
+            svc.running = False
+            return None
+        svc.storage_manager.load_pending.side_effect = load_once
 
-        assert result == data
+        svc.upload_images()
 
-    def test_compress_image_handles_empty_data(self, mock_logger):
-        """compress_image() handles empty data."""
+        svc.session.post.assert_not_called()
+        assert svc.upload_queue.qsize() == 0
+        assert svc.upload_queue.dropped == 1
+
+    def test_drained_queue_requeues_evicted_images(self, mock_logger):
         svc = _make_service(mock_logger)
-        data = b''
+        svc.upload_queue = UploadQueue(maxsize=2)
+        for name in ('a.jpg', 'b.jpg', 'c.jpg'):
+            svc.upload_queue.put((name, 'cam1'))
+        svc.upload_queue.get_nowait()
+        svc.upload_queue.get_nowait()
+        svc.storage_manager.pending_filenames.return_value = [
+            'cam_1_2026-01-01_00-00-00.jpg', 'cam1_2026-01-01_00-00-05_1.jpg']
+
+        svc._requeue_evicted()
 
-        result = svc.compress_image(data)
+        svc.storage_manager.pending_filenames.assert_called_once_with(2)
+        assert svc.upload_queue.get_nowait() == ('cam_1_2026-01-01_00-00-00.jpg', 'cam_1')
+        assert svc.upload_queue.get_nowait() == ('cam1_2026-01-01_00-00-05_1.jpg', 'cam1')
 
-        assert result == b''
+        # Nothing evicted since: the next drain leaves the queue alone
+        svc._requeue_evicted()
+        svc.storage_manager.pending_filenames.assert_called_once()
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -478,40 +802,687 @@ class TestCameraInstanceSetup:
 
 
 # ──────────────────────────────────────────────────────────────────────────────
-# CameraInstance._get_cpu_temp
+# SystemMetricsSampler
 # ──────────────────────────────────────────────────────────────────────────────
 
 @pytest.mark.smoke
-class TestGetCpuTemp:
+@patch.object(SystemMetricsSampler, 'THERMAL_ROOT', '/nonexistent/thermal')
+class TestSystemMetricsSampler:
 
     @patch("camera_service.psutil")
-    def test_cpu_temp_from_cpu_thermal(self, mock_psutil, mock_logger):
-        """_get_cpu_temp() returns temp from cpu_thermal zone."""
-        inst = _make_camera_instance(mock_logger)
+    def test_cpu_temp_from_cpu_thermal(self, mock_psutil):
+        """cpu_temp() returns temp from cpu_thermal zone."""
         temp_entry = MagicMock()
         temp_entry.current = 52.5
-        mock_psutil.sensors_temperatures.return_value = {'cpu_thermal': [temp_entry]}
+        mock_psutil.sensors_temperatures.return_value = {'other': [MagicMock(current=30.0)],
+                                                         'cpu_thermal': [temp_entry]}
 
-        result = inst._get_cpu_temp()
+        result = SystemMetricsSampler().cpu_temp()
 
         assert result == 52.5
 
     @patch("camera_service.psutil")
-    def test_cpu_temp_no_sensors(self, mock_psutil, mock_logger):
-        """_get_cpu_temp() returns None when no sensors available."""
-        inst = _make_camera_instance(mock_logger)
+    def test_cpu_temp_no_sensors(self, mock_psutil):
+        """cpu_temp() returns None when no sensors available."""
         mock_psutil.sensors_temperatures.return_value = {}
 
-        result = inst._get_cpu_temp()
+        result = SystemMetricsSampler().cpu_temp()
 
         assert result is None
 
     @patch("camera_service.psutil")
-    def test_cpu_temp_exception(self, mock_psutil, mock_logger):
-        """_get_cpu_temp() returns None on exception."""
-        inst = _make_camera_instance(mock_logger)
+    def test_cpu_temp_exception(self, mock_psutil):
+        """cpu_temp() returns None on exception."""
         mock_psutil.sensors_temperatures.side_effect = RuntimeError("no sensors")
 
-        result = inst._get_cpu_temp()
+        result = SystemMetricsSampler().cpu_temp()
 
         assert result is None
+
+    @patch("camera_service.psutil")
+    def test_cpu_temp_remembers_zone(self, mock_psutil):
+        sampler = SystemMetricsSampler()
+        mock_psutil.sensors_temperatures.return_value = {'acpitz': [MagicMock(current=40.0)]}
+        assert sampler.cpu_temp() == 40.0
+        assert sampler._temp_zone == 'acpitz'
+
+    @patch("camera_service.psutil")
+    def test_snapshot_cached_within_max_age(self, mock_psutil):
+        mock_psutil.cpu_percent.return_value = 12.0
+        mock_psutil.virtual_memory.return_value.percent = 40.04
+        mock_psutil.disk_usage.return_value.percent = 55.0
+        mock_psutil.sensors_temperatures.return_value = {}
+        sampler = SystemMetricsSampler(max_age=60)
+
+        first = sampler.snapshot()
+        second = sampler.snapshot()
+
+        assert first == second == {'cpu_percent': 12.0, 'memory_percent': 40.0,
+                                   'disk_percent': 55.0, 'cpu_temp': None}
+        assert first is not second
+        mock_psutil.disk_usage.assert_called_once_with('/')
+
+    @patch("camera_service.psutil")
+    def test_primes_cpu_percent_on_init(self, mock_psutil):
+        mock_psutil.sensors_temperatures.return_value = {}
+        sampler = SystemMetricsSampler()
+        mock_psutil.cpu_percent.assert_called_once_with(interval=None)
+        sampler.snapshot()
+        assert mock_psutil.cpu_percent.call_count == 2
+
+    @patch("camera_service.psutil")
+    def test_snapshot_resamples_when_stale(self, mock_psutil):
+        mock_psutil.sensors_temperatures.return_value = {}
+        sampler = SystemMetricsSampler(max_age=0)
+        sampler.snapshot()
+        sampler.snapshot()
+        assert mock_psutil.disk_usage.call_count == 2
+
+
+def _make_thermal_zone(root, index, zone_type, millidegrees):
+    zone = root / f"thermal_zone{index}"
+    zone.mkdir()
+    (zone / "type").write_text(f"{zone_type}\n")
+    (zone / "temp").write_text(f"{millidegrees}\n")
+    return zone
+
+
+class TestSystemMetricsSamplerSysfs:
+
+    @patch("camera_service.psutil")
+    def test_reads_cpu_zone_from_sysfs(self, mock_psutil, tmp_path):
+        _make_thermal_zone(tmp_path, 0, 'acpitz', 30000)
+        _make_thermal_zone(tmp_path, 1, 'cpu-thermal', 52512)
+        with patch.object(SystemMetricsSampler, 'THERMAL_ROOT', str(tmp_path)):
+            sampler = SystemMetricsSampler()
+        assert sampler.cpu_temp() == 52.5
+        mock_psutil.sensors_temperatures.assert_not_called()
+
+    @patch("camera_service.psutil")
+    def test_unknown_zones_fall_back_to_psutil(self, mock_psutil, tmp_path):
+        _make_thermal_zone(tmp_path, 0, 'x86_pkg_temp', 45000)
+        mock_psutil.sensors_temperatures.return_value = {'coretemp': [MagicMock(current=47.0)]}
+        with patch.object(SystemMetricsSampler, 'THERMAL_ROOT', str(tmp_path)):
+            sampler = SystemMetricsSampler()
+        assert sampler._temp_path is None
+        assert sampler.cpu_temp() == 47.0
+
+    @patch("camera_service.psutil")
+    def test_unreadable_zone_falls_back_to_psutil(self, mock_psutil, tmp_path):
+        zone = _make_thermal_zone(tmp_path, 0, 'cpu-thermal', 50000)
+        mock_psutil.sensors_temperatures.return_value = {'cpu_thermal': [MagicMock(current=51.0)]}
+        with patch.object(SystemMetricsSampler, 'THERMAL_ROOT', str(tmp_path)):
+            sampler = SystemMetricsSampler()
+        (zone / "temp").unlink()
+        assert sampler.cpu_temp() == 51.0
+        assert sampler._temp_path is None
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CameraInstance.encode_frame
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestEncodeFrame:
+
+    def test_default_jpeg_quality(self, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        assert inst.jpeg_quality == 95
+
+    def test_global_jpeg_quality_default(self, mock_logger):
+        with patch("camera_service.CameraStateTracker"), \
+             patch("cameras.camera_factory.create_camera_from_config"):
+            inst = CameraInstance(
+                camera_id='cam-test-01',
+                camera_config={'id': 'cam-test-01', 'type': 'rtsp', 'rtsp_url': 'rtsp://h/s'},
+                global_config={'device': {'id': 'node-01', 'location': 'Lab'}, 'advanced': {'jpeg_quality': 85}},
+                logger=mock_logger,
+                storage_manager=MagicMock(),
+                upload_queue=MagicMock(),
+            )
+        assert inst.jpeg_quality == 85
+
+    @patch("camera_service.simplejpeg")
+    def test_uses_simplejpeg_when_available(self, mock_simplejpeg, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        mock_simplejpeg.encode_jpeg.return_value = b'\xff\xd8jpeg'
+        frame = np.zeros((4, 4, 3), dtype=np.uint8)
+
+        result = inst.encode_frame(frame)
+
+        assert result == b'\xff\xd8jpeg'
+        _, kwargs = mock_simplejpeg.encode_jpeg.call_args
+        assert kwargs['quality'] == 95
+        assert kwargs['colorspace'] == 'BGR'
+
+    @patch("camera_service.simplejpeg")
+    def test_makes_frame_contiguous_for_simplejpeg(self, mock_simplejpeg, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        frame = np.zeros((4, 8, 3), dtype=np.uint8)[:, ::2]
+        assert not frame.flags['C_CONTIGUOUS']
+
+        inst.encode_frame(frame)
+
+        passed = mock_simplejpeg.encode_jpeg.call_args[0][0]
+        assert passed.flags['C_CONTIGUOUS']
+
+    @patch("camera_service.simplejpeg", None)
+    @patch("camera_service.cv2")
+    def test_falls_back_to_cv2_imencode(self, mock_cv2, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        mock_cv2.imencode.return_value = (True, np.frombuffer(b'\xff\xd8cv2', dtype=np.uint8))
+
+        result = inst.encode_frame(np.zeros((4, 4, 3), dtype=np.uint8))
+
+        assert isinstance(result, memoryview)
+        assert result == b'\xff\xd8cv2'
+        assert len(result) == 5
+        mock_cv2.imencode.assert_called_once()
+
+    def test_store_image_accepts_memoryview(self, tmp_path, mock_logger):
+        """The zero-copy cv2 result can be written by StorageManager as-is."""
+        from camera_service import StorageManager
+        sm = StorageManager(tmp_path, 1.0, 0.8, 7, mock_logger)
+        buffer = np.frombuffer(b'\xff\xd8data', dtype=np.uint8)
+
+        assert sm.store_image(buffer.data, 'cam1.jpg') is True
+        assert (tmp_path / 'cam1.jpg').read_bytes() == b'\xff\xd8data'
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CameraInstance.process_frame
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestProcessFrame:
+
+    @patch("camera_service.psutil")
+    @patch("camera_service.cv2")
+    def test_stores_and_queues_with_capture_time(self, mock_cv2, mock_psutil, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        inst.encode_frame = MagicMock(return_value=b'jpeg')
+        mock_psutil.cpu_percent.return_value = 1.0
+        frame = np.zeros((4, 4, 3), dtype=np.uint8)
+        captured_at = time.mktime((2024, 5, 6, 7, 8, 9, 0, 0, -1))
+
+        inst.process_frame(frame, captured_at)
+
+        filename = 'cam-test-01_2024-05-06_07-08-09.jpg'
+        args = inst.storage_manager.store_image_async.call_args[0]
+        assert args[0] == b'jpeg' and args[1] == filename
+        assert args[2]['timestamp'] == '2024-05-06_07-08-09'
+        assert args[2]['image']['sha256'] == hashlib.sha256(b'jpeg').hexdigest()
+        inst.upload_queue.put.assert_called_once_with((filename, 'cam-test-01'))
+
+    @patch("camera_service.psutil")
+    @patch("camera_service.cv2")
+    def test_same_second_captures_get_distinct_filenames(self, mock_cv2, mock_psutil, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        inst.encode_frame = MagicMock(return_value=b'jpeg')
+        mock_psutil.cpu_percent.return_value = 1.0
+        frame = np.zeros((4, 4, 3), dtype=np.uint8)
+        captured_at = time.mktime((2024, 5, 6, 7, 8, 9, 0, 0, -1))
+
+        inst.process_frame(frame, captured_at)
+        inst.process_frame(frame.copy(), captured_at + 0.5)
+
+        names = [c[0][1] for c in inst.storage_manager.store_image_async.call_args_list]
+        assert names == ['cam-test-01_2024-05-06_07-08-09.jpg', 'cam-test-01_2024-05-06_07-08-09_1.jpg']
+
+    def test_format_timestamp_cached_per_second(self, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        captured_at = time.mktime((2024, 5, 6, 7, 8, 9, 0, 0, -1))
+        with patch("camera_service.time.strftime", wraps=time.strftime) as strftime:
+            first = inst.format_timestamp(captured_at)
+            second = inst.format_timestamp(captured_at + 0.9)
+            third = inst.format_timestamp(captured_at + 1)
+        assert first[0] == second[0] == '2024-05-06_07-08-09'
+        assert (first[2], second[2], third[2]) == (0, 1, 0)
+        assert third[0] == '2024-05-06_07-08-10'
+        assert strftime.call_count == 4  # timestamp + zone, once per distinct second
+
+    def test_inline_by_default(self, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        assert inst._process_executor is None
+
+    def test_uses_shared_process_pool(self, mock_logger):
+        pool = MagicMock()
+        with patch("camera_service.CameraStateTracker"), \
+             patch("cameras.camera_factory.create_camera_from_config"):
+            inst = CameraInstance(
+                camera_id='cam-test-01',
+                camera_config={'id': 'cam-test-01', 'type': 'rtsp', 'rtsp_url': 'rtsp://h/s',
+                               'process_in_worker': True},
+                global_config={'device': {'id': 'node-01', 'location': 'Lab'}, 'advanced': {}},
+                logger=mock_logger,
+                storage_manager=MagicMock(),
+                upload_queue=MagicMock(),
+                process_pool=pool,
+            )
+        assert inst._process_executor is pool
+        inst.stop()
+        pool.shutdown.assert_not_called()
+
+    def test_worker_errors_are_logged(self, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        inst.process_frame = MagicMock(side_effect=RuntimeError("boom"))
+        inst._process_frame_logged(None, 0)
+        errors = [r for r in mock_logger._test_handler.records if r.levelno >= 40]
+        assert any("Frame processing failed" in r.getMessage() for r in errors)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CameraInstance.select_jpeg_quality
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestSelectJpegQuality:
+
+    def test_fixed_quality_by_default(self, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        inst.upload_queue.qsize.return_value = 500
+        assert inst.select_jpeg_quality() == 95
+
+    @pytest.mark.parametrize("backlog,expected", [(0, 95), (9, 95), (10, 80), (49, 80), (50, 65)])
+    def test_steps_down_with_backlog(self, mock_logger, backlog, expected):
+        inst = _make_camera_instance(mock_logger)
+        inst.adaptive_quality = True
+        inst.upload_queue.qsize.return_value = backlog
+        assert inst.select_jpeg_quality() == expected
+
+    def test_never_raises_configured_quality(self, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        inst.adaptive_quality = True
+        inst.jpeg_quality = 70
+        inst.upload_queue.qsize.return_value = 20
+        assert inst.select_jpeg_quality() == 70
+
+    def test_logs_quality_change_once(self, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        inst.adaptive_quality = True
+        inst.upload_queue.qsize.return_value = 60
+        inst.select_jpeg_quality()
+        inst.select_jpeg_quality()
+        changes = [r for r in mock_logger._test_handler.records if "JPEG quality" in r.getMessage()]
+        assert len(changes) == 1
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# UploadQueue
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestUploadQueue:
+
+    def test_fifo_order(self):
+        q = UploadQueue(maxsize=10)
+        q.put('a')
+        q.put('b')
+        assert q.get_nowait() == 'a'
+        assert q.get_nowait() == 'b'
+
+    def test_full_queue_drops_oldest(self):
+        q = UploadQueue(maxsize=2)
+        for item in ('a', 'b', 'c'):
+            q.put(item)
+        assert q.qsize() == 2
+        assert q.dropped == 1
+        assert q.get_nowait() == 'b'
+
+    def test_take_overflow_reports_eviction_once(self):
+        q = UploadQueue(maxsize=1)
+        q.put('a')
+        assert q.take_overflow() is False
+        q.put('b')
+        assert q.take_overflow() is True
+        assert q.take_overflow() is False
+
+    def test_get_nowait_empty_raises(self):
+        q = UploadQueue(maxsize=2)
+        assert q.empty()
+        with pytest.raises(Empty):
+            q.get_nowait()
+
+    def test_get_times_out_when_empty(self):
+        q = UploadQueue(maxsize=2)
+        start = time.monotonic()
+        with pytest.raises(Empty):
+            q.get(timeout=0.05)
+        assert time.monotonic() - start >= 0.04
+
+    def test_get_wakes_on_put(self):
+        q = UploadQueue(maxsize=2)
+        Thread(target=lambda: (time.sleep(0.05), q.put('late'))).start()
+        assert q.get(timeout=2) == 'late'
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# setup_http_session
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestSetupHttpSession:
+
+    def test_mounts_pooled_adapter(self, mock_logger):
+        svc = _make_service(mock_logger)
+        svc.setup_http_session()
+        adapter = svc.session.get_adapter('https://api.test/upload')
+        assert adapter._pool_maxsize == 4
+        assert adapter.max_retries.total == 2
+        assert adapter.max_retries.connect == 2
+        # The one-shot multipart stream can't be resent, so no status/read retries
+        assert not adapter.max_retries.is_retry('POST', 503)
+        assert adapter.max_retries.read == 0
+        assert svc.upload_workers == 1
+
+    def test_pool_grows_with_upload_workers(self, mock_logger):
+        svc = _make_service(mock_logger)
+        svc.config['server']['upload_workers'] = 8
+        svc.setup_http_session()
+        adapter = svc.session.get_adapter('https://api.test/upload')
+        assert svc.upload_workers == 8
+        assert adapter._pool_maxsize == 8
+
+    @patch("camera_service.httpx")
+    def test_http2_uses_httpx_client(self, mock_httpx, mock_logger):
+        svc = _make_service(mock_logger)
+        svc.config['server']['http2'] = True
+        svc.setup_http_session()
+        assert svc._http2 is True
+        assert svc.session is mock_httpx.Client.return_value
+        assert mock_httpx.Client.call_args.kwargs['http2'] is True
+        assert mock_httpx.Client.call_args.kwargs['verify'] is False
+
+    @patch("camera_service.httpx", None)
+    def test_http2_without_httpx_falls_back(self, mock_logger):
+        svc = _make_service(mock_logger)
+        svc.config['server']['http2'] = True
+        svc.setup_http_session()
+        assert svc._http2 is False
+        assert svc.session.get_adapter('https://api.test/upload')._pool_maxsize == 4
+
+    @patch("camera_service.httpx")
+    def test_http2_without_h2_falls_back(self, mock_httpx, mock_logger):
+        mock_httpx.Client.side_effect = ImportError("Using http2=True, but the 'h2' package is not installed")
+        svc = _make_service(mock_logger)
+        svc.config['server']['http2'] = True
+        svc.setup_http_session()
+        assert svc._http2 is False
+        assert svc.session.get_adapter('https://api.test/upload')._pool_maxsize == 4
+        warnings = [r for r in mock_logger._test_handler.records if r.levelno == 30]
+        assert any("h2" in r.getMessage() for r in warnings)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# send_watchdog_notification
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestWatchdogNotification:
+
+    @patch("camera_service.daemon")
+    def test_disabled_sends_nothing(self, mock_daemon, mock_logger):
+        svc = _make_service(mock_logger)
+        svc.watchdog_usec = 0
+        svc._last_watchdog_ping = 0.0
+        svc.send_watchdog_notification()
+        mock_daemon.notify.assert_not_called()
+
+    @patch("camera_service.daemon")
+    def test_skips_ping_within_quarter_timeout(self, mock_daemon, mock_logger):
+        svc = _make_service(mock_logger)
+        svc.watchdog_usec = 20_000_000  # 20s -> pings at most every 5s
+        svc._last_watchdog_ping = 0.0
+        with patch("camera_service.time.monotonic", side_effect=[100.0, 103.0, 105.5]):
+            svc.send_watchdog_notification()
+            svc.send_watchdog_notification()
+            svc.send_watchdog_notification()
+        assert mock_daemon.notify.call_count == 2
+        mock_daemon.notify.assert_called_with('WATCHDOG=1')
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# setup_opencv
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestSetupOpencv:
+
+    @patch("camera_service.cv2")
+    def test_defaults_to_one_thread(self, mock_cv2, mock_logger):
+        svc = _make_service(mock_logger)
+        svc.setup_opencv()
+        mock_cv2.setUseOptimized.assert_called_once_with(True)
+        mock_cv2.setNumThreads.assert_called_once_with(1)
+
+    @patch("camera_service.cv2")
+    def test_thread_count_from_config(self, mock_cv2, mock_logger):
+        svc = _make_service(mock_logger)
+        svc.config['advanced']['opencv_threads'] = 4
+        svc.setup_opencv()
+        mock_cv2.setNumThreads.assert_called_once_with(4)
+
+    @patch("camera_service.os.cpu_count", return_value=8)
+    @patch("camera_service.cv2")
+    def test_auto_splits_cores_across_cameras(self, mock_cv2, _cpu, mock_logger):
+        svc = _make_service(mock_logger)
+        svc.config['advanced']['opencv_threads'] = 'auto'
+        svc.config['cameras'] = [{'id': f'cam{i}'} for i in range(3)]
+        svc.setup_opencv()
+        mock_cv2.setNumThreads.assert_called_once_with(2)
+
+    @patch("camera_service.os.cpu_count", return_value=4)
+    @patch("camera_service.cv2")
+    def test_auto_never_drops_below_one(self, mock_cv2, _cpu, mock_logger):
+        svc = _make_service(mock_logger)
+        svc.config['advanced']['opencv_threads'] = 'auto'
+        svc.config['cameras'] = [{'id': f'cam{i}'} for i in range(6)]
+        svc.setup_opencv()
+        mock_cv2.setNumThreads.assert_called_once_with(1)
+
+    @patch("camera_service.simplejpeg", None)
+    @patch("camera_service.cv2")
+    def test_logs_jpeg_encoder_backend(self, mock_cv2, mock_logger):
+        svc = _make_service(mock_logger)
+        svc.setup_opencv()
+        records = mock_logger._test_handler.records
+        assert any(r.getMessage() == "JPEG encoder: cv2.imencode" for r in records)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# setup_queues
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestSetupQueues:
+
+    @patch("camera_service.os.sched_setaffinity", create=True)
+    def test_process_cpus_pins_pool_threads(self, mock_affinity, mock_logger):
+        svc = _make_service(mock_logger)
+        svc.config['advanced']['process_cpus'] = [2, 3]
+        svc.setup_queues()
+        try:
+            svc.process_pool.submit(lambda: None).result(timeout=5)
+        finally:
+            svc.process_pool.shutdown(wait=True)
+        mock_affinity.assert_called_once_with(0, {2, 3})
+
+    @patch("camera_service.os.sched_setaffinity", create=True)
+    def test_pool_unpinned_by_default(self, mock_affinity, mock_logger):
+        svc = _make_service(mock_logger)
+        svc.setup_queues()
+        try:
+            svc.process_pool.submit(lambda: None).result(timeout=5)
+        finally:
+            svc.process_pool.shutdown(wait=True)
+        mock_affinity.assert_not_called()
+
+    @patch("camera_service.os.sched_setaffinity", create=True, side_effect=OSError("bad cpu"))
+    def test_pin_failure_is_logged(self, _affinity, mock_logger):
+        svc = _make_service(mock_logger)
+        svc._pin_process_worker({7})
+        warnings = [r for r in mock_logger._test_handler.records if r.levelno == 30]
+        assert any("Could not pin" in r.getMessage() for r in warnings)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CameraInstance.downscale_frame
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestDownscaleFrame:
+
+    def test_no_target_returns_frame_unchanged(self, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+        assert inst.target_resolution is None
+        assert inst.downscale_frame(frame) is frame
+
+    @patch("camera_service.cv2")
+    def test_resizes_larger_frame_with_inter_area(self, mock_cv2, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        inst.target_resolution = (960, 540)
+        frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+
+        inst.downscale_frame(frame)
+
+        args, kwargs = mock_cv2.resize.call_args
+        assert args[1] == (960, 540)
+        assert kwargs['interpolation'] is mock_cv2.INTER_AREA
+
+    @patch("camera_service.cv2")
+    def test_never_upscales(self, mock_cv2, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        inst.target_resolution = (1920, 1080)
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+
+        assert inst.downscale_frame(frame) is frame
+        mock_cv2.resize.assert_not_called()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CameraInstance.brightness_avg
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestBrightnessAvg:
+
+    @patch("camera_service.cv2")
+    def test_averages_channels_of_strided_sample(self, mock_cv2, mock_logger):
+        mock_cv2.mean.return_value = (30.0, 60.0, 90.0, 0.0)
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        assert CameraInstance.brightness_avg(frame) == 60.0
+        assert mock_cv2.mean.call_args[0][0].shape == (180, 320, 3)
+
+    @patch("camera_service.cv2")
+    def test_single_channel_frame(self, mock_cv2, mock_logger):
+        mock_cv2.mean.return_value = (42.0, 0.0, 0.0, 0.0)
+        assert CameraInstance.brightness_avg(np.zeros((8, 8), dtype=np.uint8)) == 42.0
+
+# ──────────────────────────────────────────────────────────────────────────────
+# CameraInstance.is_static_frame
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestIsStaticFrame:
+
+    def test_disabled_by_default(self, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        assert inst.motion_threshold == 0
+        assert inst.is_static_frame(frame) is False
+        assert inst._prev_thumb is None
+
+    @patch("camera_service.cv2")
+    def test_first_frame_is_never_static(self, mock_cv2, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        inst.motion_threshold = 2.0
+        assert inst.is_static_frame(np.zeros((720, 1280, 3), dtype=np.uint8)) is False
+        mock_cv2.absdiff.assert_not_called()
+
+    @patch("camera_service.cv2")
+    def test_compares_against_threshold(self, mock_cv2, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        inst.motion_threshold = 2.0
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        inst.is_static_frame(frame)
+
+        mock_cv2.mean.return_value = (0.5, 0, 0, 0)
+        assert inst.is_static_frame(frame) is True
+        mock_cv2.mean.return_value = (12.0, 0, 0, 0)
+        assert inst.is_static_frame(frame) is False
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# _build_upload_body
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestBuildUploadBody:
+
+    def test_streams_with_multipart_encoder(self, mock_logger):
+        pytest.importorskip("requests_toolbelt")
+        svc = _make_service(mock_logger)
+        kwargs = svc._build_upload_body('cam1.jpg', b'\xff\xd8jpeg', b'{"camera_id": "cam1"}',
+                                        {'Authorization': 'Bearer tok'})
+
+        assert 'files' not in kwargs
+        assert kwargs['headers']['Authorization'] == 'Bearer tok'
+        assert kwargs['headers']['Content-Type'].startswith('multipart/form-data')
+        body = kwargs['data'].to_string()
+        assert b'\xff\xd8jpeg' in body
+        assert b'"camera_id"' in body and b'"cam1"' in body
+
+    def test_encoder_accepts_memoryview(self, mock_logger):
+        pytest.importorskip("requests_toolbelt")
+        svc = _make_service(mock_logger)
+        view = np.frombuffer(b'\xff\xd8view', dtype=np.uint8).data
+        kwargs = svc._build_upload_body('cam1.jpg', view, b'{}', {})
+        assert b'\xff\xd8view' in kwargs['data'].to_string()
+
+    @patch("camera_service.MultipartEncoder", None)
+    def test_falls_back_to_files(self, mock_logger):
+        svc = _make_service(mock_logger)
+        kwargs = svc._build_upload_body('cam1.jpg', b'jpeg', b'{"a": 1}', {'Authorization': 'Bearer tok'})
+
+        assert 'data' not in kwargs
+        assert kwargs['files']['image'] == ('cam1.jpg', b'jpeg', 'image/jpeg')
+        assert kwargs['files']['metadata'][1] == b'{"a": 1}'
+        assert kwargs['headers'] == {'Authorization': 'Bearer tok'}
+
+    def test_http2_sends_bytes_files(self, mock_logger):
+        svc = _make_service(mock_logger)
+        svc._http2 = True
+        view = np.frombuffer(b'\xff\xd8view', dtype=np.uint8).data
+        kwargs = svc._build_upload_body('cam1.jpg', view, b'{}', {})
+        assert 'data' not in kwargs
+        assert kwargs['files']['image'] == ('cam1.jpg', b'\xff\xd8view', 'image/jpeg')
+
+    @patch("camera_service.MultipartEncoder", None)
+    def test_batch_body_contract(self, mock_logger):
+        svc = _make_service(mock_logger)
+        items = [('a.jpg', b'A', b'{"n": 0}', 'cam1'), ('b.jpg', b'B', b'{"n": 1}', 'cam2')]
+        kwargs = svc._build_batch_upload_body(items, {})
+
+        files = kwargs['files']
+        assert files['image_0'] == ('a.jpg', b'A', 'image/jpeg')
+        assert files['image_1'] == ('b.jpg', b'B', 'image/jpeg')
+        assert json.loads(files['metadata'][1]) == [{'n': 0}, {'n': 1}]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Timestamp overlay settings
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestOverlaySettings:
+
+    def test_defaults_match_original_overlay(self, mock_logger):
+        inst = _make_camera_instance(mock_logger)
+        assert inst.overlay_timestamp is True
+        assert inst.overlay_font_scale == 1.0
+        assert inst.overlay_thickness == 2
+        assert inst.overlay_origin == (10, 30)
+
+    def test_font_scales_with_target_resolution(self, mock_logger):
+        with patch("camera_service.CameraStateTracker"), \
+             patch("cameras.camera_factory.create_camera_from_config"):
+            inst = CameraInstance(
+                camera_id='cam1',
+                camera_config={'id': 'cam1', 'rtsp_url': 'rtsp://h/s', 'resolution': [1920, 1080],
+                               'target_resolution': [960, 540]},
+                global_config={'device': {'id': 'n', 'location': 'l'}},
+                logger=mock_logger,
+                storage_manager=MagicMock(),
+                upload_queue=MagicMock(),
+            )
+        assert inst.overlay_font_scale == 0.5
+        assert inst.overlay_thickness == 1
+        assert inst.overlay_origin == (10, 15)
@@ -119,11 +119,32 @@ class TestCheckSystemHealth:
 
     @patch("camera_service.psutil")
     def test_exception_increments_error_count(self, mock_psutil, mock_logger):
-        mock_psutil.cpu_percent.side_effect = RuntimeError("boom")
         hm = _make_monitor(mock_logger)
+        mock_psutil.cpu_percent.side_effect = RuntimeError("boom")
         hm.check_system_health()
         assert hm.metrics['error_count'] == 1
 
+    @patch("camera_service.psutil")
+    def test_cpu_sampling_does_not_block(self, mock_psutil, mock_logger):
+        _setup_psutil(mock_psutil, cpu=10, mem=30, disk=50)
+        hm = _make_monitor(mock_logger)
+        hm.check_system_health()
+        for call in mock_psutil.cpu_percent.call_args_list:
+            assert call.kwargs.get('interval') is None
+
+    @patch("camera_service.psutil")
+    def test_reads_shared_metrics_sampler(self, mock_psutil, mock_logger):
+        mock_psutil.sensors_temperatures.return_value = {}
+        sampler = MagicMock()
+        sampler.snapshot.return_value = {'cpu_percent': 95.0, 'memory_percent': 30.0,
+                                         'disk_percent': 50.0, 'cpu_temp': None}
+        hm = HealthMonitor(_make_monitor(mock_logger).config, mock_logger, MagicMock(),
+                           metrics_sampler=sampler)
+        hm.check_system_health()
+        sampler.snapshot.assert_called_once_with()
+        mock_psutil.virtual_memory.assert_not_called()
+        assert hm.metrics['warning_count'] == 1
+
     @patch("camera_service.psutil")
     def test_periodic_logging_at_count_60(self, mock_psutil, mock_logger):
         _setup_psutil(mock_psutil, cpu=10, mem=30, disk=50)
@@ -7,7 +7,8 @@ import pytest
 
 # The onvif module is pre-mocked in conftest.py, so ONVIFCamera is a MagicMock.
 # We need to make sure the import check in onvif_camera.py finds it.
-from cameras.onvif_camera import ONVIFCameraImpl
+import cameras.onvif_camera as onvif_camera
+from cameras.onvif_camera import ONVIFCameraImpl, detect_wsdl_path
 
 
 # ---------------------------------------------------------------------------
@@ -55,6 +56,51 @@ def cam(mock_logger):
         return ONVIFCameraImpl('cam-onvif-01', _cam_config(), _global_config(), mock_logger)
 
 
+@pytest.fixture(autouse=True)
+def _reset_wsdl_cache(monkeypatch):
+    """Each test starts with no cached WSDL path."""
+    monkeypatch.setattr(onvif_camera, '_detected_wsdl_path', None)
+
+
+# ---------------------------------------------------------------------------
+# detect_wsdl_path
+# ---------------------------------------------------------------------------
+
+class TestDetectWsdlPath:
+
+    def test_returns_first_existing_path(self, monkeypatch):
+        monkeypatch.setattr(onvif_camera, 'WSDL_CANDIDATE_PATHS', ['/missing/', '/present/', '/also/'])
+        with patch("cameras.onvif_camera.os.path.exists", side_effect=lambda p: p != '/missing/'):
+            path, checked = detect_wsdl_path()
+        assert path == '/present/'
+        assert checked == ['/missing/']
+
+    def test_caches_hit_without_probing_again(self, monkeypatch):
+        monkeypatch.setattr(onvif_camera, 'WSDL_CANDIDATE_PATHS', ['/present/'])
+        with patch("cameras.onvif_camera.os.path.exists", return_value=True) as mock_exists:
+            detect_wsdl_path()
+            path, _ = detect_wsdl_path()
+        assert path == '/present/'
+        assert mock_exists.call_count == 1
+
+    def test_miss_is_not_cached(self, monkeypatch):
+        monkeypatch.setattr(onvif_camera, 'WSDL_CANDIDATE_PATHS', ['/a/', '/b*/'])
+        with patch("cameras.onvif_camera.os.path.exists", return_value=False), \
+             patch("cameras.onvif_camera.glob.glob", return_value=[]):
+            path, checked = detect_wsdl_path()
+        assert path is None
+        assert checked == ['/a/', '/b*/ (no matches)']
+        assert onvif_camera._detected_wsdl_path is None
+
+    def test_glob_match_used_directly(self, monkeypatch):
+        monkeypatch.setattr(onvif_camera, 'WSDL_CANDIDATE_PATHS', ['/usr/lib/python3*/wsdl/'])
+        with patch("cameras.onvif_camera.glob.glob", return_value=['/usr/lib/python3.11/wsdl/']), \
+             patch("cameras.onvif_camera.os.path.exists") as mock_exists:
+            path, _ = detect_wsdl_path()
+        assert path == '/usr/lib/python3.11/wsdl/'
+        mock_exists.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # Constructor
 # ---------------------------------------------------------------------------
@@ -1,5 +1,7 @@
 """Tests for src/cameras/rtsp_camera.py — RTSP camera implementation."""
 
+import time
+
 import numpy as np
 from unittest.mock import patch, MagicMock
 
@@ -128,6 +130,39 @@ class TestRTSPCameraSetup:
         # Should release cap on frame failure
         mock_cap.release.assert_called_once()
 
+    @patch("time.sleep")
+    def test_setup_uses_gstreamer_pipeline(self, mock_sleep, mock_logger):
+        import cv2
+        cam = RTSPCamera('cam-rtsp-01', _cam_config(gstreamer_pipeline='rtspsrc ! appsink'),
+                         _global_config(), mock_logger)
+        mock_cap = MagicMock()
+        mock_cap.isOpened.return_value = True
+        mock_cap.read.return_value = (True, np.zeros((4, 4, 3), dtype=np.uint8))
+        mock_cap.get.return_value = 15.0
+        cv2.VideoCapture.return_value = mock_cap
+
+        assert cam.setup() is True
+        cv2.VideoCapture.assert_called_once_with('rtspsrc ! appsink', cv2.CAP_GSTREAMER)
+
+    @patch("time.sleep")
+    def test_setup_gstreamer_falls_back_to_ffmpeg(self, mock_sleep, mock_logger):
+        import cv2
+        cam = RTSPCamera('cam-rtsp-01', _cam_config(gstreamer_pipeline='rtspsrc ! appsink'),
+                         _global_config(), mock_logger)
+        gst_cap = MagicMock()
+        gst_cap.isOpened.return_value = False
+        ffmpeg_cap = MagicMock()
+        ffmpeg_cap.isOpened.return_value = True
+        ffmpeg_cap.read.return_value = (True, np.zeros((4, 4, 3), dtype=np.uint8))
+        ffmpeg_cap.get.return_value = 15.0
+        cv2.VideoCapture.side_effect = [gst_cap, ffmpeg_cap]
+        try:
+            assert cam.setup() is True
+        finally:
+            cv2.VideoCapture.side_effect = None
+        gst_cap.release.assert_called_once()
+        assert cv2.VideoCapture.call_args[0] == (cam.rtsp_url, cv2.CAP_FFMPEG)
+
     @patch("time.sleep")
     def test_setup_exception(self, mock_sleep, cam):
         import cv2
@@ -165,10 +200,29 @@ class TestRTSPCameraCaptureFrame:
         frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
         cam.cap = MagicMock()
         cam.cap.isOpened.return_value = True
-        cam.cap.read.return_value = (True, frame)
+        cam.cap.grab.return_value = True
+        cam.cap.retrieve.return_value = (True, frame)
         result = cam.capture_frame()
         assert result is not None
         assert result.shape == (1080, 1920, 3)
+        cam.cap.read.assert_not_called()
+
+    @patch("time.sleep")
+    def test_grab_fail_skips_retrieve(self, mock_sleep, cam):
+        """A failed grab() never calls retrieve() on that capture."""
+        cam.is_connected = True
+        cap1 = MagicMock()
+        cap1.isOpened.return_value = True
+        cap1.grab.return_value = False
+        cam.cap = cap1
+
+        import cv2
+        cap2 = MagicMock()
+        cap2.isOpened.return_value = False
+        cv2.VideoCapture.return_value = cap2
+
+        assert cam.capture_frame() is None
+        cap1.retrieve.assert_not_called()
 
     @patch("time.sleep")
     def test_read_fail_triggers_reconnect_retry(self, mock_sleep, cam):
@@ -178,7 +232,8 @@ class TestRTSPCameraCaptureFrame:
         # First cap: read fails
         cap1 = MagicMock()
         cap1.isOpened.return_value = True
-        cap1.read.return_value = (False, None)
+        cap1.grab.return_value = True
+        cap1.retrieve.return_value = (False, None)
         cam.cap = cap1
 
         # After reconnect: setup creates a new cap
@@ -186,6 +241,8 @@ class TestRTSPCameraCaptureFrame:
         cap2 = MagicMock()
         cap2.isOpened.return_value = True
         cap2.read.return_value = (True, frame)
+        cap2.grab.return_value = True
+        cap2.retrieve.return_value = (True, frame)
         cap2.get.return_value = 15.0
 
         import cv2
@@ -200,7 +257,8 @@ class TestRTSPCameraCaptureFrame:
         cam.is_connected = True
         cap1 = MagicMock()
         cap1.isOpened.return_value = True
-        cap1.read.return_value = (False, None)
+        cap1.grab.return_value = True
+        cap1.retrieve.return_value = (False, None)
         cam.cap = cap1
 
         import cv2
@@ -215,7 +273,7 @@ class TestRTSPCameraCaptureFrame:
         cam.is_connected = True
         cam.cap = MagicMock()
         cam.cap.isOpened.return_value = True
-        cam.cap.read.side_effect = RuntimeError("decode error")
+        cam.cap.grab.side_effect = RuntimeError("decode error")
         assert cam.capture_frame() is None
 
 
@@ -244,6 +302,52 @@ class TestRTSPCameraGrabFrame:
         assert cam.grab_frame() is True
 
 
+# ---------------------------------------------------------------------------
+# background grab thread
+# ---------------------------------------------------------------------------
+
+class TestRTSPCameraGrabThread:
+
+    def _connected_cam(self, mock_logger):
+        cam = RTSPCamera('c1', _cam_config(grab_thread=True, fps=50), _global_config(), mock_logger)
+        cam.is_connected = True
+        cam.cap = MagicMock()
+        cam.cap.isOpened.return_value = True
+        cam.cap.grab.return_value = True
+        return cam
+
+    def test_disabled_by_default(self, cam):
+        assert cam.grab_thread is False
+        assert cam._grab_thread is None
+
+    def test_capture_reuses_fresh_grab(self, mock_logger):
+        cam = self._connected_cam(mock_logger)
+        frame = np.zeros((10, 10, 3), dtype=np.uint8)
+        cam.cap.retrieve.return_value = (True, frame)
+        cam._fresh_grab = True
+        assert cam.capture_frame() is frame
+        cam.cap.grab.assert_not_called()
+        assert cam._fresh_grab is False
+
+    def test_thread_grabs_and_stops_on_cleanup(self, mock_logger):
+        cam = self._connected_cam(mock_logger)
+        cap = cam.cap
+        cam._start_grab_thread()
+        try:
+            for _ in range(100):
+                if cam._fresh_grab:
+                    break
+                time.sleep(0.01)
+            assert cam._fresh_grab is True
+            # Keep-alive grabs are left to the thread
+            cap.grab.reset_mock()
+            assert cam.grab_frame() is True
+        finally:
+            cam.cleanup()
+        assert cam._grab_thread is None
+        cap.release.assert_called_once()
+
+
 # ---------------------------------------------------------------------------
 # cleanup
 # ---------------------------------------------------------------------------
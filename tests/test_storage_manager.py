@@ -1,6 +1,7 @@
 """Tests for StorageManager from src/camera_service.py — uses tmp_path for real filesystem."""
 
 import json
+import os
 import time
 from pathlib import Path
 from unittest.mock import patch
@@ -23,6 +24,17 @@ def _make_manager(tmp_path, mock_logger, **overrides):
     return StorageManager(**defaults)
 
 
+def _make_expired_image(tmp_path, name="old.jpg"):
+    """Put an uploaded image past the default 7-day retention under tmp_path/storage."""
+    uploaded = tmp_path / "storage" / "uploaded"
+    uploaded.mkdir(parents=True, exist_ok=True)
+    old = uploaded / name
+    old.write_bytes(b"\xff" * 100)
+    eight_days_ago = time.time() - 8 * 24 * 3600
+    os.utime(old, (eight_days_ago, eight_days_ago))
+    return old
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Constructor
 # ──────────────────────────────────────────────────────────────────────────────
@@ -59,6 +71,13 @@ class TestStoreImage:
         stored = json.loads(meta_file.read_text())
         assert stored["camera_id"] == "cam1"
 
+    def test_metadata_serialized_with_orjson(self, tmp_path, mock_logger):
+        orjson = pytest.importorskip("orjson")
+        sm = _make_manager(tmp_path, mock_logger)
+        with patch("camera_service.orjson", orjson):
+            sm.store_image(b"\xff", "cam1.jpg", metadata={"a": 1})
+        assert (sm.metadata_path / "cam1.jpg.json").read_bytes() == b'{"a":1}'
+
     def test_no_metadata_when_none(self, tmp_path, mock_logger):
         sm = _make_manager(tmp_path, mock_logger)
         sm.store_image(b"\xff" * 50, "cam1.jpg", metadata=None)
@@ -74,6 +93,45 @@ class TestStoreImage:
         sm = _make_manager(tmp_path, mock_logger)
         assert sm.store_image(b"\xff", "test.jpg") is True
 
+    def test_schedules_cleanup_past_threshold(self, tmp_path, mock_logger):
+        _make_expired_image(tmp_path)
+        sm = _make_manager(tmp_path, mock_logger, cleanup_threshold_gb=0)
+        with patch.object(sm, "cleanup_old_files") as mock_cleanup:
+            sm.store_image(b"\xff" * 50, "cam1.jpg")
+            sm.close()
+        mock_cleanup.assert_called_once_with()
+
+    def test_no_cleanup_when_nothing_expired(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger, cleanup_threshold_gb=0)
+        with patch.object(sm, "cleanup_old_files") as mock_cleanup:
+            sm.store_image(b"\xff" * 50, "cam1.jpg")
+            sm.close()
+        mock_cleanup.assert_not_called()
+
+    def test_cleanup_scheduling_rate_limited(self, tmp_path, mock_logger):
+        _make_expired_image(tmp_path)
+        sm = _make_manager(tmp_path, mock_logger, cleanup_threshold_gb=0)
+        with patch.object(sm, "cleanup_old_files") as mock_cleanup:
+            for i in range(5):
+                sm.store_image(b"\xff" * 50, f"cam{i}.jpg")
+                sm._cleanup_future.result(timeout=5)
+            sm.close()
+        mock_cleanup.assert_called_once_with()
+
+    def test_no_cleanup_below_threshold(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger)
+        with patch.object(sm, "cleanup_old_files") as mock_cleanup:
+            sm.store_image(b"\xff" * 50, "cam1.jpg")
+            sm.close()
+        mock_cleanup.assert_not_called()
+
+    def test_accepts_memoryview_and_short_writes(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger)
+        real_write = os.write
+        with patch("camera_service.os.write", side_effect=lambda fd, buf: real_write(fd, buf[:3])):
+            sm.store_image(memoryview(b"0123456789"), "img.jpg")
+        assert (sm.base_path / "img.jpg").read_bytes() == b"0123456789"
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # mark_as_uploaded
@@ -100,6 +158,113 @@ class TestMarkAsUploaded:
         sm.store_image(b"\xff" * 50, "img.jpg")
         assert sm.mark_as_uploaded("img.jpg") is True
 
+    def test_missing_source_is_not_an_error(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger)
+        assert sm.mark_as_uploaded("never-stored.jpg") is True
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# load_pending
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestLoadPending:
+
+    def test_reads_back_image_and_metadata(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger)
+        sm.store_image(b"\xff\xd8data", "img.jpg", metadata={"camera_id": "cam1"})
+        image_data, metadata_json = sm.load_pending("img.jpg")
+        assert image_data == b"\xff\xd8data"
+        assert json.loads(metadata_json) == {"camera_id": "cam1"}
+
+    def test_missing_image_returns_none(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger)
+        assert sm.load_pending("gone.jpg") is None
+
+    def test_waits_for_queued_write(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger, async_writes=True)
+        sm.store_image_async(b"\xff" * 10, "img.jpg")
+        assert sm.load_pending("img.jpg") == (b"\xff" * 10, b"{}")
+        sm.close()
+
+    def test_failed_write_is_served_from_memory(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger, async_writes=True)
+        with patch.object(sm, "_write_file", side_effect=OSError("read-only filesystem")):
+            sm.store_image_async(b"\xff\xd8data", "img.jpg", metadata={"camera_id": "cam1"})
+            image_data, metadata_json = sm.load_pending("img.jpg")
+        assert image_data == b"\xff\xd8data"
+        assert json.loads(metadata_json) == {"camera_id": "cam1"}
+        assert not (sm.base_path / "img.jpg").exists()
+
+        sm.mark_as_uploaded("img.jpg")
+        assert sm.load_pending("img.jpg") is None
+        sm.close()
+
+    def test_unstored_images_are_capped(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger)
+        sm.UNSTORED_MAX_IMAGES = 2
+        with patch.object(sm, "_write_file", side_effect=OSError("disk full")):
+            for i in range(3):
+                assert sm.store_image(b"\xff", f"img{i}.jpg") is False
+        assert sm.load_pending("img0.jpg") is None
+        assert sm.load_pending("img2.jpg") == (b"\xff", b"{}")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# pending_filenames
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestPendingFilenames:
+
+    def test_oldest_first_and_limited(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger)
+        for name in ("a.jpg", "b.jpg", "c.jpg"):
+            sm.store_image(b"\xff", name)
+        sm.mark_as_uploaded("a.jpg")
+        assert sm.pending_filenames(10) == ["b.jpg", "c.jpg"]
+        assert sm.pending_filenames(1) == ["b.jpg"]
+
+    def test_includes_unstored_images(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger)
+        sm.store_image(b"\xff", "a.jpg")
+        with patch.object(sm, "_write_file", side_effect=OSError("disk full")):
+            sm.store_image(b"\xff", "b.jpg")
+        assert sm.pending_filenames(10) == ["a.jpg", "b.jpg"]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# store_image_async
+# ──────────────────────────────────────────────────────────────────────────────
+
+class TestStoreImageAsync:
+
+    def test_inline_when_disabled(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger)
+        assert sm.store_image_async(b"\xff" * 50, "img.jpg") is True
+        assert (sm.base_path / "img.jpg").exists()
+
+    def test_close_flushes_queued_writes(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger, async_writes=True)
+        for i in range(5):
+            sm.store_image_async(b"\xff" * 50, f"img{i}.jpg", metadata={"i": i})
+        sm.close()
+        assert all((sm.base_path / f"img{i}.jpg").exists() for i in range(5))
+        assert sm._pending_writes == {}
+
+    def test_mark_as_uploaded_waits_for_write(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger, async_writes=True)
+        original = sm.store_image
+
+        def slow_store(*args, **kwargs):
+            time.sleep(0.05)
+            return original(*args, **kwargs)
+
+        sm.store_image = slow_store
+        sm.store_image_async(b"\xff" * 50, "img.jpg")
+        assert sm.mark_as_uploaded("img.jpg") is True
+        assert (sm.uploaded_path / "img.jpg").exists()
+        assert not (sm.base_path / "img.jpg").exists()
+        sm.close()
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # get_current_size_gb
@@ -112,12 +277,27 @@ class TestGetCurrentSizeGb:
         assert sm.get_current_size_gb() == pytest.approx(0, abs=0.001)
 
     def test_correct_calculation_with_known_files(self, tmp_path, mock_logger):
-        sm = _make_manager(tmp_path, mock_logger)
+        # Existing files are counted by the initial scan
+        base = tmp_path / "storage"
+        base.mkdir()
         # Write exactly 1 MiB = 1/1024 GiB
-        (sm.base_path / "test.bin").write_bytes(b"\x00" * (1024 * 1024))
+        (base / "test.bin").write_bytes(b"\x00" * (1024 * 1024))
+        sm = _make_manager(tmp_path, mock_logger)
         expected_gb = 1.0 / 1024
         assert sm.get_current_size_gb() == pytest.approx(expected_gb, rel=0.01)
 
+    def test_store_image_updates_counter(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger)
+        sm.store_image(b"\xff" * 1000, "img.jpg", metadata={"k": "v"})
+        assert sm._current_bytes == sm._scan_size_bytes()
+
+    def test_counter_includes_files_present_at_startup(self, tmp_path, mock_logger):
+        base = tmp_path / "storage"
+        base.mkdir()
+        (base / "external.bin").write_bytes(b"\x00" * 2048)
+        sm = _make_manager(tmp_path, mock_logger)
+        assert sm._current_bytes == 2048
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # cleanup_old_files
@@ -151,6 +331,7 @@ class TestCleanupOldFiles:
         sm.mark_as_uploaded("img.jpg")
         sm.cleanup_old_files(force=True)
         assert not (sm.uploaded_path / "img.jpg").exists()
+        assert sm._current_bytes == sm._scan_size_bytes()
 
     def test_respects_retention_days(self, tmp_path, mock_logger):
         sm = _make_manager(tmp_path, mock_logger, cleanup_threshold_gb=0, retention_days=9999)
@@ -161,6 +342,13 @@ class TestCleanupOldFiles:
         # File should still exist because retention=9999 days
         assert (sm.uploaded_path / "img.jpg").exists()
 
+    def test_nothing_deleted_logs_info(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger, cleanup_threshold_gb=0)
+        sm.store_image(b"\xff" * 100, "img.jpg")
+        sm.cleanup_old_files()
+        done = [r for r in mock_logger._test_handler.records if "Cleanup completed" in r.getMessage()]
+        assert [r.levelname for r in done] == ["INFO"]
+
     def test_stops_at_target(self, tmp_path, mock_logger):
         """Once below threshold, stop deleting."""
         # threshold=0 means always cleanup; files are small so all get cleaned
@@ -173,6 +361,73 @@ class TestCleanupOldFiles:
         # All should be deleted when threshold=0
         assert len(remaining) == 0
 
+    def test_indexes_files_present_at_startup(self, tmp_path, mock_logger):
+        base = tmp_path / "storage"
+        (base / "uploaded").mkdir(parents=True)
+        old = base / "uploaded" / "old.jpg"
+        old.write_bytes(b"\xff" * 100)
+        eight_days_ago = time.time() - 8 * 24 * 3600
+        os.utime(old, (eight_days_ago, eight_days_ago))
+        (base / "pending.jpg").write_bytes(b"\xff" * 100)
+
+        sm = _make_manager(tmp_path, mock_logger, cleanup_threshold_gb=0)
+        assert list(sm._uploaded_index) == ["old.jpg"]
+        assert list(sm._pending_index) == ["pending.jpg"]
+
+        sm.cleanup_old_files()
+        assert not old.exists()
+        assert (base / "pending.jpg").exists()
+
+    def test_externally_deleted_files_leave_the_counter(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger, cleanup_threshold_gb=0)
+        sm.store_image(b"\xff" * 100, "img.jpg", {"a": 1})
+        sm.mark_as_uploaded("img.jpg")
+        (sm.uploaded_path / "img.jpg").unlink()  # e.g. removed by hand
+
+        sm.cleanup_old_files(force=True)
+
+        assert not (sm.uploaded_metadata_path / "img.jpg.json").exists()
+        assert sm._current_bytes == sm._scan_size_bytes() == 0
+
+    def test_mark_as_uploaded_moves_index_entry(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger)
+        sm.store_image(b"\xff" * 100, "img.jpg")
+        assert "img.jpg" in sm._pending_index
+        sm.mark_as_uploaded("img.jpg")
+        assert "img.jpg" not in sm._pending_index
+        assert sm._uploaded_index["img.jpg"][1] == 100
+
+    def test_failed_delete_stays_indexed_and_counted(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger, cleanup_threshold_gb=0)
+        for name in ("a.jpg", "b.jpg"):
+            sm.store_image(b"\xff" * 100, name)
+            sm.mark_as_uploaded(name)
+        before = sm._current_bytes
+        real_unlink = os.unlink
+
+        def unlink(path, *args, **kwargs):
+            if str(path).endswith("a.jpg"):
+                raise PermissionError("read-only")
+            return real_unlink(path, *args, **kwargs)
+
+        with patch("camera_service.os.unlink", side_effect=unlink):
+            sm.cleanup_old_files(force=True)
+
+        assert list(sm._uploaded_index) == ["a.jpg"]
+        assert (sm.uploaded_path / "a.jpg").exists()
+        assert sm._current_bytes == before - 100 == sm._scan_size_bytes()
+
+    def test_uploaded_index_ordered_by_store_time(self, tmp_path, mock_logger):
+        sm = _make_manager(tmp_path, mock_logger)
+        for i, name in enumerate(("a.jpg", "b.jpg", "c.jpg")):
+            with patch("camera_service.time.time", return_value=1000.0 + i):
+                sm.store_image(b"\xff" * 100, name)
+        # Requeued upload of the oldest image finishes last
+        sm.mark_as_uploaded("b.jpg")
+        sm.mark_as_uploaded("c.jpg")
+        sm.mark_as_uploaded("a.jpg")
+        assert list(sm._uploaded_index) == ["a.jpg", "b.jpg", "c.jpg"]
+
     def test_concurrent_lock(self, tmp_path, mock_logger):
         """Second cleanup call while first is in progress should be skipped."""
         sm = _make_manager(tmp_path, mock_logger)